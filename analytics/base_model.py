@@ -1,15 +1,18 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 import joblib
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, mean_squared_error
 from pathlib import Path
 
+def _take(data, indices):
+    return data.iloc[indices] if hasattr(data, 'iloc') else data[indices]
+
 class BaseMLModel(ABC):
     def __init__(self, model_name: str):
         self.model_name = model_name
         self.model = None
         self.is_trained = False
+        self._split_cache = {}
     
     @abstractmethod
     def prepare_features(self, df: pd.DataFrame) -> tuple:
@@ -19,9 +22,20 @@ class BaseMLModel(ABC):
     def build_model(self):
         pass
     
-    def train(self, df: pd.DataFrame, target_column: str):
+    def split_indices(self, n_samples: int, test_size: float = 0.2, random_state: int = 42) -> tuple:
+        # Same permutation train_test_split would draw, computed once per shape
+        key = (n_samples, test_size, random_state)
+        if key not in self._split_cache:
+            from sklearn.model_selection import ShuffleSplit
+            splitter = ShuffleSplit(n_splits=1, test_size=test_size, random_state=random_state)
+            self._split_cache[key] = next(splitter.split(np.zeros(n_samples)))
+        return self._split_cache[key]
+    
+    def train(self, df: pd.DataFrame, target_column: str, split: tuple = None):
         X, y = self.prepare_features(df)
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        train_idx, test_idx = split if split is not None else self.split_indices(len(X))
+        X_train, X_test = _take(X, train_idx), _take(X, test_idx)
+        y_train, y_test = _take(y, train_idx), _take(y, test_idx)
         
         self.model = self.build_model()
         self.model.fit(X_train, y_train)
@@ -37,9 +51,24 @@ class BaseMLModel(ABC):
         X, _ = self.prepare_features(df)
         return self.model.predict(X)
     
-    def save_model(self):
+    def save_model(self, compress: int = 3):
         model_path = Path("analytics/ml_models") / f"{self.model_name}.joblib"
-        joblib.dump(self.model, model_path)
+        joblib.dump(self.model, model_path, compress=compress, protocol=5)
+    
+    def save_model_mmap(self):
+        # Uncompressed dump so large estimator arrays can be memory-mapped on load
+        model_path = Path("analytics/ml_models") / f"{self.model_name}.mmap.joblib"
+        joblib.dump(self.model, model_path, protocol=5)
+    
+    def load_model(self, mmap_mode: str = None):
+        model_dir = Path("analytics/ml_models")
+        mmap_path = model_dir / f"{self.model_name}.mmap.joblib"
+        if mmap_mode and mmap_path.exists():
+            self.model = joblib.load(mmap_path, mmap_mode=mmap_mode)
+        else:
+            self.model = joblib.load(model_dir / f"{self.model_name}.joblib")
+        self.is_trained = True
+        return self.model
     
     @abstractmethod
     def evaluate(self, y_true, y_pred):
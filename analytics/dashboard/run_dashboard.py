@@ -4,8 +4,6 @@ Dashboard Runner Script
 Launch the Streamlit dashboard for vehicle market analysis
 """
 
-import subprocess
-import sys
 from pathlib import Path
 
 def main():
@@ -19,13 +17,15 @@ def main():
     print("=" * 60)
     
     try:
-        # Launch Streamlit
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            str(dashboard_path),
-            "--server.port", "8501",
-            "--server.address", "localhost"
-        ])
+        # Launch Streamlit in this interpreter instead of a second Python process
+        from streamlit.web import bootstrap
+        
+        flag_options = {
+            "server.port": 8501,
+            "server.address": "localhost"
+        }
+        bootstrap.load_config_options(flag_options=flag_options)
+        bootstrap.run(str(dashboard_path), False, [], flag_options)
     except KeyboardInterrupt:
         print("\nDashboard stopped by user")
     except Exception as e:
@@ -3,11 +3,23 @@ import pandas as pd
 import numpy as np
 import sqlite3
 import json
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import html
 from pathlib import Path
 
+# Fast JSON decoding (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Arrow string storage (optional)
+try:
+    import pyarrow
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
 # Page config
 st.set_page_config(
     page_title="Costa Rica Vehicle Market Intelligence",
@@ -16,15 +28,79 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Columns the dashboard pages actually read; skips description and other bulky text
+DASHBOARD_COLUMNS = [
+    'vehicle_id', 'url', 'brand', 'model', 'year', 'price_usd', 'mileage',
+    'fuel_type', 'transmission', 'vehicle_age', 'is_luxury',
+    'seller_phone', 'seller_whatsapp', 'images'
+]
+
 # Load data and models
-@st.cache_data
-def load_data():
-    """Load clean vehicle data"""
+@st.cache_resource
+def get_conn():
+    """Shared connection to the clean vehicle database"""
     project_root = Path(__file__).parent.parent.parent
     db_path = project_root / "data" / "vehicles_clean.db"
     
-    with sqlite3.connect(db_path) as conn:
-        df = pd.read_sql_query("SELECT * FROM vehicles_clean", conn)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    
+    # Read-side tuning: memory-mapped pages and a 64 MB page cache
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    
+    return conn
+
+@st.cache_data
+def load_filter_options():
+    """Row count, price range and brand list for the sidebar filters"""
+    conn = get_conn()
+    count, price_min, price_max = conn.execute(
+        "SELECT COUNT(*), MIN(price_usd), MAX(price_usd) FROM vehicles_clean"
+    ).fetchone()
+    brands = [row[0] for row in conn.execute(
+        "SELECT DISTINCT brand FROM vehicles_clean WHERE brand IS NOT NULL ORDER BY brand"
+    )]
+    
+    return {
+        'count': count,
+        'min': int(price_min or 0),
+        'max': int(price_max or 0),
+        'brands': brands
+    }
+
+@st.cache_data(max_entries=32, ttl=3600)
+def load_data(price_lo, price_hi, brands=None):
+    """Load clean vehicle data matching the sidebar filters (brands=None means all)"""
+    # Rows without a brand are never selectable in the sidebar, so they stay out even when all brands are chosen
+    query = (f"SELECT {', '.join(DASHBOARD_COLUMNS)} FROM vehicles_clean "
+             "WHERE price_usd BETWEEN ? AND ? AND brand IS NOT NULL")
+    params = [price_lo, price_hi]
+    if brands is not None:
+        query += f" AND brand IN ({', '.join('?' * len(brands))})"
+        params.extend(brands)
+    # Listing order, as a full-table read returned it; the brand/price index would otherwise reorder rows
+    query += " ORDER BY id"
+    
+    df = pd.read_sql_query(query, get_conn(), params=params)
+    
+    # Low-cardinality text columns: integer codes make groupby and masks cheaper
+    for col in ('brand', 'model', 'fuel_type', 'transmission'):
+        df[col] = df[col].astype('category')
+    # SQLite hands BOOLEAN back as 0/1 integers
+    df['is_luxury'] = df['is_luxury'].astype(bool)
+    
+    # Split the comma-separated image list once instead of per rendered row
+    df['first_image'] = df['images'].str.split(',', n=1).str[0].str.strip()
+    # First 3 images for the listing cards (tuples keep the frame hashable for st.cache_data)
+    df['image_urls'] = [
+        tuple(url.strip() for url in images.split(',')[:3] if url.strip()) if isinstance(images, str) else ()
+        for images in df['images']
+    ]
+    
+    # Arrow-backed strings for the free-text columns when pyarrow is installed
+    if ARROW_AVAILABLE:
+        for col in ('vehicle_id', 'url', 'seller_phone', 'seller_whatsapp', 'images', 'first_image'):
+            df[col] = df[col].astype('string[pyarrow]')
     
     return df
 
@@ -34,9 +110,61 @@ def load_recommendations():
     project_root = Path(__file__).parent.parent.parent
     rec_path = project_root / "analytics" / "reports" / "ml_recommendations.json"
     
+    if ORJSON_AVAILABLE:
+        return orjson.loads(rec_path.read_bytes())
+    
     with open(rec_path, 'r') as f:
         return json.load(f)
 
+@st.cache_data(max_entries=32, ttl=3600)
+def brand_performance_stats(df):
+    """Per-brand volume, price and age metrics"""
+    brand_stats = df.groupby('brand', observed=True, sort=False).agg(
+        Volume=('price_usd', 'count'),
+        Avg_Price=('price_usd', 'mean'),
+        Median_Price=('price_usd', 'median'),
+        Price_Std=('price_usd', 'std'),
+        Avg_Age=('vehicle_age', 'mean'),
+        Is_Luxury=('is_luxury', 'first')
+    ).round(2)
+    
+    return brand_stats[brand_stats['Volume'] >= 5].sort_values('Avg_Price', ascending=False)
+
+@st.cache_data(max_entries=32, ttl=3600)
+def brand_aggregates(df):
+    """Per-brand price mean/median, volume and luxury flag"""
+    return df.groupby('brand', observed=True, sort=False).agg(
+        mean_price=('price_usd', 'mean'),
+        median_price=('price_usd', 'median'),
+        count=('price_usd', 'size'),
+        luxury=('is_luxury', 'first')
+    )
+
+@st.cache_data(max_entries=32, ttl=3600)
+def price_summary(df):
+    """Row count and price range in a single pass"""
+    prices = df['price_usd'].to_numpy()
+    return {
+        'count': len(prices),
+        'min': int(prices.min()) if len(prices) else 0,
+        'max': int(prices.max()) if len(prices) else 0
+    }
+
+@st.cache_data(max_entries=32, ttl=3600)
+def sorted_prices(df):
+    """Sorted price array for O(log n) percentile lookups"""
+    return np.sort(df['price_usd'].to_numpy())
+
+@st.cache_data(max_entries=32, ttl=3600)
+def vehicles_by_brand_year(df):
+    """Vehicles indexed by sorted (brand, year) for range lookups, keeping each row's listing position"""
+    return df.dropna(subset=['year']).rename_axis('row').reset_index().set_index(['brand', 'year']).sort_index()
+
+@st.cache_data(max_entries=32, ttl=3600)
+def brand_options(df):
+    """Sorted brands present in the frame, for selectboxes"""
+    return sorted(df['brand'].unique())
+
 def create_kpi_cards(df, recommendations):
     """Create KPI cards"""
     market_insights = recommendations['market_insights']
@@ -71,8 +199,12 @@ def create_kpi_cards(df, recommendations):
             delta=f"{market_insights['market_share']:.1f}% share"
         )
 
+@st.cache_data(max_entries=32, ttl=3600)
 def create_price_distribution(df):
     """Create price distribution chart"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
     fig = make_subplots(
         rows=1, cols=2,
         subplot_titles=['Price Distribution', 'Price by Brand (Top 8)']
@@ -85,7 +217,7 @@ def create_price_distribution(df):
     )
     
     # Price by brand
-    top_brands = df['brand'].value_counts().head(8).index
+    top_brands = df['brand'].value_counts(sort=False).nlargest(8).index
     df_top = df[df['brand'].isin(top_brands)]
     
     fig.add_trace(
@@ -101,9 +233,13 @@ def create_price_distribution(df):
     
     return fig
 
+@st.cache_data(max_entries=32, ttl=3600)
 def create_market_share_chart(df):
     """Create market share pie chart"""
-    brand_counts = df['brand'].value_counts().head(10)
+    import plotly.express as px
+    
+    brand_counts = df['brand'].value_counts(sort=False).nlargest(10)
+    brand_counts = brand_counts[brand_counts > 0]
     
     fig = px.pie(
         values=brand_counts.values,
@@ -116,28 +252,44 @@ def create_market_share_chart(df):
     
     return fig
 
+@st.cache_data(max_entries=32, ttl=3600)
 def create_price_vs_age_chart(df):
     """Create price vs age scatter plot"""
+    import plotly.graph_objects as go
+    
     valid_data = df.dropna(subset=['vehicle_age', 'price_usd'])
     
-    fig = px.scatter(
-        valid_data,
-        x='vehicle_age',
-        y='price_usd',
-        color='is_luxury',
+    # WebGL traces: one draw call per luxury group instead of one SVG node per point
+    fig = go.Figure()
+    for is_luxury, color in ((False, 'lightblue'), (True, 'gold')):
+        group = valid_data[valid_data['is_luxury'] == is_luxury]
+        fig.add_trace(
+            go.Scattergl(
+                x=group['vehicle_age'].to_numpy(),
+                y=group['price_usd'].to_numpy(),
+                mode='markers',
+                name=str(is_luxury),
+                marker=dict(color=color),
+                hovertemplate='Age: %{x}<br>Price: $%{y:,.0f}<extra></extra>'
+            )
+        )
+    
+    fig.update_layout(
         title='Price vs Vehicle Age',
-        labels={'vehicle_age': 'Vehicle Age (years)', 'price_usd': 'Price (USD)'},
-        color_discrete_map={True: 'gold', False: 'lightblue'}
+        xaxis_title='Vehicle Age (years)',
+        yaxis_title='Price (USD)',
+        legend_title_text='is_luxury'
     )
     
-    # Add trend line
-    z = np.polyfit(valid_data['vehicle_age'], valid_data['price_usd'], 1)
-    p = np.poly1d(z)
+    # Add trend line (a straight line only needs its two endpoints)
+    ages = valid_data['vehicle_age'].to_numpy(dtype=float)
+    slope, intercept = np.polyfit(ages, valid_data['price_usd'].to_numpy(dtype=float), 1)
+    trend_x = np.array([ages.min(), ages.max()])
     
     fig.add_trace(
         go.Scatter(
-            x=valid_data['vehicle_age'],
-            y=p(valid_data['vehicle_age']),
+            x=trend_x,
+            y=slope * trend_x + intercept,
             mode='lines',
             name='Trend Line',
             line=dict(color='red', dash='dash')
@@ -147,8 +299,11 @@ def create_price_vs_age_chart(df):
     fig.update_layout(height=400)
     return fig
 
+@st.cache_resource
 def create_feature_importance_chart(recommendations):
-    """Create feature importance chart"""
+    """Create feature importance chart (static per report, built once)"""
+    import plotly.express as px
+    
     features = recommendations['key_features']['most_important']
     
     # Mock importance scores (in real app, load from saved model)
@@ -175,7 +330,7 @@ def price_prediction_tool(df, recommendations):
         st.write("**Vehicle Details**")
         
         # Input fields
-        brand = st.selectbox("Brand", options=sorted(df['brand'].unique()))
+        brand = st.selectbox("Brand", options=brand_options(df))
         year = st.slider("Year", min_value=2000, max_value=2025, value=2020)
         engine_cc = st.number_input("Engine CC", min_value=1000, max_value=6000, value=2000)
         fuel_type = st.selectbox("Fuel Type", options=['Gasoline', 'Diesel', 'Hybrid'])
@@ -188,8 +343,9 @@ def price_prediction_tool(df, recommendations):
         if st.button("Predict Price", type="primary"):
             # Calculate derived features
             vehicle_age = 2025 - year
-            brand_value = df.groupby('brand')['price_usd'].mean().get(brand, df['price_usd'].mean())
-            is_luxury = brand in ['BMW', 'Mercedes-Benz', 'Audi', 'Porsche', 'Lexus']
+            brand_stats = brand_aggregates(df)
+            brand_value = brand_stats['mean_price'].get(brand, df['price_usd'].mean())
+            is_luxury = bool(brand_stats['luxury'].get(brand, False))
             
             # Simple prediction model (in real app, use trained model)
             base_price = brand_value
@@ -210,24 +366,28 @@ def price_prediction_tool(df, recommendations):
             st.info(f"Confidence Interval: ${lower_bound:,.0f} - ${upper_bound:,.0f}")
             
             # Market position
-            percentile = (df['price_usd'] < predicted_price).mean() * 100
+            prices = sorted_prices(df)
+            percentile = np.searchsorted(prices, predicted_price) / len(prices) * 100
             st.write(f"**Market Position:** {percentile:.0f}th percentile")
             
             # Similar vehicles
-            similar = df[
-                (df['brand'] == brand) & 
-                (abs(df['year'] - year) <= 2) &
-                (df['price_usd'].between(lower_bound, upper_bound))
-            ].head(3)
+            try:
+                similar = vehicles_by_brand_year(df).loc[pd.IndexSlice[brand, year - 2:year + 2], :]
+            except KeyError:
+                similar = df.iloc[0:0]
+            # First matches in listing order, not (brand, year) order
+            similar = similar[similar['price_usd'].between(lower_bound, upper_bound)]
+            similar = similar.sort_values('row').head(3).reset_index()
             
             if not similar.empty:
                 st.write("**Similar Vehicles:**")
-                for _, vehicle in similar.iterrows():
+                brand_median = brand_aggregates(df)['median_price']
+                for vehicle in similar.to_dict('records'):
                     col_a, col_b, col_c = st.columns([2, 1, 1])
                     with col_a:
                         # ML Price Analysis for similar vehicles
                         vehicle_age = 2025 - vehicle['year']
-                        brand_avg = df[df['brand'] == vehicle['brand']]['price_usd'].median()
+                        brand_avg = brand_median[vehicle['brand']]
                         predicted_price = brand_avg * max(0.6, 1 - (vehicle_age * 0.06))
                         price_vs_ml = ((vehicle['price_usd'] - predicted_price) / predicted_price * 100)
                         
@@ -247,6 +407,13 @@ def price_prediction_tool(df, recommendations):
                         if pd.notna(vehicle['url']):
                             st.markdown(f"[View Car]({vehicle['url']})")
 
+def price_deviation_pct(prices, estimate):
+    """Percent difference of listed prices vs estimate, computed in one buffer"""
+    deviation = np.subtract(prices, estimate, dtype=float)
+    np.divide(deviation, estimate, out=deviation)
+    np.multiply(deviation, 100, out=deviation)
+    return deviation
+
 def vehicle_listings_page(df):
     """Vehicle listings with ML insights"""
     st.header("Vehicle Listings with ML Analysis")
@@ -257,47 +424,49 @@ def vehicle_listings_page(df):
     # Filters for listings
     col1, col2, col3 = st.columns(3)
     with col1:
-        selected_brand = st.selectbox("Filter by Brand", options=['All'] + sorted(df['brand'].unique()))
+        selected_brand = st.selectbox("Filter by Brand", options=['All'] + brand_options(df))
     with col2:
-        max_price = st.number_input("Max Price ($)", min_value=0, max_value=int(df['price_usd'].max()), value=min(50000, int(df['price_usd'].max())))
+        price_max = price_summary(df)['max']
+        max_price = st.number_input("Max Price ($)", min_value=0, max_value=price_max, value=min(50000, price_max))
     with col3:
         max_age = st.number_input("Max Age (years)", min_value=0, max_value=30, value=10)
     
     # Apply filters
-    filtered_df = df.copy()
+    mask = (df['price_usd'] <= max_price) & (df['vehicle_age'] <= max_age)
     if selected_brand != 'All':
-        filtered_df = filtered_df[filtered_df['brand'] == selected_brand]
-    filtered_df = filtered_df[
-        (filtered_df['price_usd'] <= max_price) & 
-        (filtered_df['vehicle_age'] <= max_age)
-    ]
+        mask &= df['brand'] == selected_brand
+    filtered_df = df[mask]
     
     # Calculate ML scores and sort by deal quality
-    ml_scores = []
-    for _, vehicle in filtered_df.iterrows():
-        vehicle_age = 2025 - vehicle['year']
-        brand_avg = df[df['brand'] == vehicle['brand']]['price_usd'].median()
-        predicted_price = brand_avg * max(0.6, 1 - (vehicle_age * 0.06))
-        price_pct = ((vehicle['price_usd'] - predicted_price) / predicted_price * 100)
-        ml_scores.append(price_pct)
-    
-    filtered_df = filtered_df.copy()
-    filtered_df['ml_score'] = ml_scores
-    filtered_df = filtered_df.sort_values('ml_score').head(20)  # Sort by best deals first
+    brand_median = brand_aggregates(df)['median_price']
+    # Age factor max(0.6, 1 - age * 0.06) built in a single buffer
+    predicted_price = 2025 - filtered_df['year'].to_numpy(dtype=float)
+    np.multiply(predicted_price, -0.06, out=predicted_price)
+    np.add(predicted_price, 1, out=predicted_price)
+    np.fmax(predicted_price, 0.6, out=predicted_price)
+    np.multiply(predicted_price, filtered_df['brand'].map(brand_median).to_numpy(dtype=float), out=predicted_price)
+    filtered_df = filtered_df.assign(
+        ml_base=predicted_price,
+        ml_score=price_deviation_pct(filtered_df['price_usd'].to_numpy(), predicted_price)
+    )
+    filtered_df = filtered_df.nsmallest(20, 'ml_score')  # Best deals first, partial sort
+    
+    # Mileage-adjusted estimate for the displayed vehicles
+    mileage = filtered_df['mileage'].to_numpy(dtype=float)
+    ml_estimate = mileage / -400000
+    np.add(ml_estimate, 1, out=ml_estimate)
+    np.fmax(ml_estimate, 0.7, out=ml_estimate)
+    ml_estimate[np.isnan(mileage)] = 0.85  # Mileage not specified
+    np.multiply(ml_estimate, filtered_df['ml_base'].to_numpy(), out=ml_estimate)
+    filtered_df = filtered_df.assign(
+        ml_estimate=ml_estimate,
+        ml_estimate_pct=price_deviation_pct(filtered_df['price_usd'].to_numpy(), ml_estimate)
+    )
     
     # Quick ML stats
     if not filtered_df.empty:
-        good_deals = 0
-        overpriced = 0
-        for _, vehicle in filtered_df.iterrows():
-            vehicle_age = 2025 - vehicle['year']
-            brand_avg = df[df['brand'] == vehicle['brand']]['price_usd'].median()
-            predicted_price = brand_avg * max(0.6, 1 - (vehicle_age * 0.06))
-            price_pct = ((vehicle['price_usd'] - predicted_price) / predicted_price * 100)
-            if price_pct < -10:
-                good_deals += 1
-            elif price_pct > 10:
-                overpriced += 1
+        good_deals = int((filtered_df['ml_score'] < -10).sum())
+        overpriced = int((filtered_df['ml_score'] > 10).sum())
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -309,13 +478,36 @@ def vehicle_listings_page(df):
     
     st.write(f"Showing {len(filtered_df)} vehicles with ML analysis")
     
+    view = st.radio("View", ["Cards", "Table"], horizontal=True)
+    if view == "Table":
+        # Single serialized table instead of one widget tree per vehicle
+        display_df = filtered_df.assign(
+            deal=np.select(
+                [filtered_df['ml_score'] < -15, filtered_df['ml_score'] < -5, filtered_df['ml_score'] > 15],
+                ["🟢 GREAT DEAL", "🟡 GOOD VALUE", "🔴 OVERPRICED"],
+                default="🟡 FAIR PRICE"
+            )
+        )[['deal', 'first_image', 'year', 'brand', 'model', 'price_usd', 'ml_score', 'mileage',
+           'fuel_type', 'transmission', 'seller_phone', 'seller_whatsapp', 'url']]
+        
+        st.dataframe(
+            display_df,
+            column_config={
+                "first_image": st.column_config.ImageColumn("Image"),
+                "price_usd": st.column_config.NumberColumn("Price", format="$%d"),
+                "ml_score": st.column_config.NumberColumn("vs Estimate", format="%+.0f%%"),
+                "seller_whatsapp": st.column_config.LinkColumn("WhatsApp"),
+                "url": st.column_config.LinkColumn("CRAutos")
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+        return
+    
     # Display vehicles with ML insights
-    for _, vehicle in filtered_df.iterrows():
-        # Calculate ML score for title
-        vehicle_age = 2025 - vehicle['year']
-        brand_avg = df[df['brand'] == vehicle['brand']]['price_usd'].median()
-        predicted_price = brand_avg * max(0.6, 1 - (vehicle_age * 0.06))
-        price_pct = ((vehicle['price_usd'] - predicted_price) / predicted_price * 100)
+    for vehicle in filtered_df.to_dict('records'):
+        # ML score for title
+        price_pct = vehicle['ml_score']
         
         if price_pct < -15:
             ml_badge = "🟢 GREAT DEAL"
@@ -332,13 +524,8 @@ def vehicle_listings_page(df):
             with col1:
                 # ML Price Analysis
                 vehicle_age = 2025 - vehicle['year']
-                brand_avg = df[df['brand'] == vehicle['brand']]['price_usd'].median()
-                age_factor = max(0.6, 1 - (vehicle_age * 0.06))
-                mileage_factor = max(0.7, 1 - (vehicle.get('mileage', 50000) / 400000)) if pd.notna(vehicle['mileage']) else 0.85
-                predicted_price = brand_avg * age_factor * mileage_factor
-                
-                price_diff = vehicle['price_usd'] - predicted_price
-                price_pct = (price_diff / predicted_price * 100)
+                predicted_price = vehicle['ml_estimate']
+                price_pct = vehicle['ml_estimate_pct']
                 
                 st.write(f"**Year:** {vehicle['year']} (Age: {vehicle_age} years)")
                 st.write(f"**Listed Price:** ${vehicle['price_usd']:,.0f}")
@@ -358,17 +545,15 @@ def vehicle_listings_page(df):
                 st.write(f"**Transmission:** {vehicle['transmission']}" if pd.notna(vehicle['transmission']) else "**Transmission:** Not specified")
                 
                 # Images
-                if pd.notna(vehicle['images']) and vehicle['images']:
-                    image_urls = [url.strip() for url in vehicle['images'].split(',')[:3] if url.strip()]  # Show first 3 images
-                    if image_urls:
-                        st.write("**Images:**")
-                        img_cols = st.columns(len(image_urls))
-                        for i, img_url in enumerate(image_urls):
-                            with img_cols[i]:
-                                try:
-                                    st.image(img_url, width=120)
-                                except:
-                                    st.markdown(f"[Image {i+1}]({img_url})")
+                image_urls = vehicle['image_urls']
+                if image_urls:
+                    st.write("**Images:**")
+                    # One HTML block; the browser fetches lazily and in parallel
+                    gallery = ''.join(
+                        f'<img src="{html.escape(img_url)}" width="120" loading="lazy" style="margin-right:4px">'
+                        for img_url in image_urls
+                    )
+                    st.markdown(gallery, unsafe_allow_html=True)
             
             with col2:
                 st.write("**ML Insights:**")
@@ -411,17 +596,12 @@ def vehicle_listings_page(df):
 
 def brand_analysis_page(df, recommendations):
     """Brand analysis page"""
+    import plotly.express as px
+    
     st.header("Brand Performance Analysis")
     
     # Brand metrics
-    brand_stats = df.groupby('brand').agg({
-        'price_usd': ['count', 'mean', 'median', 'std'],
-        'vehicle_age': 'mean',
-        'is_luxury': 'first'
-    }).round(2)
-    
-    brand_stats.columns = ['Volume', 'Avg_Price', 'Median_Price', 'Price_Std', 'Avg_Age', 'Is_Luxury']
-    brand_stats = brand_stats[brand_stats['Volume'] >= 5].sort_values('Avg_Price', ascending=False)
+    brand_stats = brand_performance_stats(df)
     
     col1, col2 = st.columns(2)
     
@@ -452,7 +632,7 @@ def main():
     st.markdown("*Data-driven insights for the Costa Rican automotive market*")
     
     # Load data
-    df = load_data()
+    filter_options = load_filter_options()
     recommendations = load_recommendations()
     
     # Sidebar
@@ -468,25 +648,23 @@ def main():
     # Price range filter
     price_range = st.sidebar.slider(
         "Price Range (USD)",
-        min_value=int(df['price_usd'].min()),
-        max_value=int(df['price_usd'].max()),
-        value=(int(df['price_usd'].min()), int(df['price_usd'].max()))
+        min_value=filter_options['min'],
+        max_value=filter_options['max'],
+        value=(filter_options['min'], filter_options['max'])
     )
     
     # Brand filter
     selected_brands = st.sidebar.multiselect(
         "Select Brands",
-        options=sorted(df['brand'].unique()),
-        default=sorted(df['brand'].unique())
+        options=filter_options['brands'],
+        default=filter_options['brands']
     )
     
-    # Apply filters
-    df_filtered = df[
-        (df['price_usd'].between(price_range[0], price_range[1])) &
-        (df['brand'].isin(selected_brands))
-    ]
+    # Apply filters in SQL so only matching rows are loaded; skip the IN list when every brand is selected
+    brand_filter = None if set(selected_brands) == set(filter_options['brands']) else tuple(sorted(selected_brands))
+    df_filtered = load_data(price_range[0], price_range[1], brand_filter)
     
-    st.sidebar.write(f"Showing {len(df_filtered):,} of {len(df):,} vehicles")
+    st.sidebar.write(f"Showing {len(df_filtered):,} of {filter_options['count']:,} vehicles")
     
     # Page content
     if page == "Market Overview":
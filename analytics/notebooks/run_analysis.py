@@ -10,27 +10,21 @@ import sqlite3
 from pathlib import Path
 import warnings
 import json
+import os
+import importlib.util
 warnings.filterwarnings('ignore')
 
-# Statistical Analysis
-from scipy import stats
-from scipy.stats import pearsonr, spearmanr
+# Machine learning libraries are imported inside the functions that use them,
+# keeping start-up fast for the SQL-only parts of the analysis
 
-# Machine Learning
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.feature_selection import mutual_info_regression
+# Visualization (optional); probe availability without paying the import cost
+PLOTTING_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ('matplotlib', 'seaborn'))
 
-# Visualization (optional)
-try:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    PLOTTING_AVAILABLE = True
-except ImportError:
-    PLOTTING_AVAILABLE = False
+# Columns the analysis actually reads; skips free text (description, images, contacts)
+ANALYSIS_COLUMNS = [
+    'brand', 'model', 'year', 'price_usd', 'mileage', 'fuel_type', 'transmission',
+    'engine_cc', 'exchange_rate', 'vehicle_age', 'price_per_year', 'is_luxury'
+]
 
 def load_clean_data():
     """Load clean data from database"""
@@ -38,37 +32,34 @@ def load_clean_data():
     db_path = project_root / "data" / "vehicles_clean.db"
     
     with sqlite3.connect(db_path) as conn:
-        df = pd.read_sql_query("SELECT * FROM vehicles_clean", conn)
+        df = pd.read_sql_query(f"SELECT {', '.join(ANALYSIS_COLUMNS)} FROM vehicles_clean", conn)
     
     print(f"Loaded {len(df)} records from clean database")
     return df, project_root
 
 def engineer_features(df):
     """Create advanced features for ML"""
-    df_features = df.copy()
-    
-    # Create new features
-    df_features['log_price'] = np.log(df_features['price_usd'])
-    df_features['price_per_cc'] = df_features['price_usd'] / df_features['engine_cc']
-    df_features['age_squared'] = df_features['vehicle_age'] ** 2
-    df_features['mileage_per_year'] = df_features['mileage'] / (df_features['vehicle_age'] + 1)
-    df_features['is_new'] = (df_features['vehicle_age'] <= 2).astype(int)
-    df_features['is_vintage'] = (df_features['vehicle_age'] >= 20).astype(int)
-    
-    # Brand value encoding
-    brand_value = df_features.groupby('brand')['price_usd'].mean().to_dict()
-    df_features['brand_value_score'] = df_features['brand'].map(brand_value)
-    
-    # Model popularity
-    model_popularity = df_features['model'].value_counts().to_dict()
-    df_features['model_popularity'] = df_features['model'].map(model_popularity).fillna(1)
+    # assign() returns a new frame that shares the untouched column buffers instead of copying them
+    df_features = df.assign(
+        log_price=np.log(df['price_usd']),
+        price_per_cc=df['price_usd'] / df['engine_cc'],
+        age_squared=df['vehicle_age'] ** 2,
+        mileage_per_year=df['mileage'] / (df['vehicle_age'] + 1),
+        is_new=(df['vehicle_age'] <= 2).astype(int),
+        is_vintage=(df['vehicle_age'] >= 20).astype(int),
+        # Brand value encoding (broadcast group means without a dict round-trip)
+        brand_value_score=df.groupby('brand', sort=False)['price_usd'].transform('mean'),
+        # Model popularity
+        model_popularity=df.groupby('model', sort=False)['price_usd'].transform('size').fillna(1)
+    )
     
     print(f"Created {len(df_features.columns) - len(df.columns)} new features")
     return df_features
 
 def prepare_ml_data(df):
     """Prepare data for machine learning"""
-    ml_df = df.copy()
+    from sklearn.compose import ColumnTransformer
+    from sklearn.preprocessing import OneHotEncoder
     
     # Select features
     numeric_features = ['year', 'engine_cc', 'vehicle_age', 'brand_value_score', 
@@ -76,26 +67,67 @@ def prepare_ml_data(df):
     categorical_features = ['fuel_type', 'transmission', 'is_luxury']
     
     # Filter available features
-    numeric_features = [f for f in numeric_features if f in ml_df.columns]
-    categorical_features = [f for f in categorical_features if f in ml_df.columns]
-    
-    # Handle missing values and infinite values
-    for col in numeric_features:
-        ml_df[col] = ml_df[col].fillna(ml_df[col].median())
-        # Replace infinite values
-        ml_df[col] = ml_df[col].replace([np.inf, -np.inf], ml_df[col].median())
-    
-    for col in categorical_features:
-        ml_df[col] = ml_df[col].fillna('Unknown')
-    
-    # One-hot encode
-    ml_df_encoded = pd.get_dummies(ml_df[numeric_features + categorical_features], 
-                                  columns=categorical_features, drop_first=True)
-    
-    return ml_df_encoded, ml_df['price_usd']
+    numeric_features = [f for f in numeric_features if f in df.columns]
+    categorical_features = [f for f in categorical_features if f in df.columns]
+    
+    # Work on the model columns only rather than copying the whole frame
+    ml_df = df[numeric_features + categorical_features + ['price_usd']]
+    
+    # Handle missing and infinite values in one pass: both become the column's finite median
+    values = ml_df[numeric_features].to_numpy(dtype=np.float64, na_value=np.nan)
+    finite_mask = np.isfinite(values)
+    medians = np.nanmedian(np.where(finite_mask, values, np.nan), axis=0)
+    ml_df[numeric_features] = np.where(finite_mask, values, medians)
+    
+    ml_df[categorical_features] = ml_df[categorical_features].fillna('Unknown').astype(str)
+    
+    # One-hot encode with a fitted encoder so unseen data can be transformed the same way
+    encoder = ColumnTransformer(
+        [('num', 'passthrough', numeric_features),
+         ('cat', OneHotEncoder(drop='first', handle_unknown='ignore', sparse_output=False, dtype=np.float32),
+          categorical_features)],
+        verbose_feature_names_out=False
+    ).set_output(transform='pandas')
+    ml_df_encoded = encoder.fit_transform(ml_df)
+    
+    # float32 features halve the bytes scaling and tree traversal move; target stays float64 for the metrics
+    return ml_df_encoded.astype(np.float32), ml_df['price_usd'], encoder
+
+def _fit_eval(name, model, X_tr, X_te, y_train, y_test):
+    """Fit one model and collect its test and cross-validation metrics"""
+    from sklearn.model_selection import cross_val_score
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    
+    # Fit and predict
+    model.fit(X_tr, y_train)
+    y_pred = model.predict(X_te)
+    
+    # Metrics
+    r2 = r2_score(y_test, y_pred)
+    mae = mean_absolute_error(y_test, y_pred)
+    rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+    
+    # Cross-validation (serial: each model already has its own worker)
+    cv_scores = cross_val_score(model, X_tr, y_train, cv=5, scoring='r2', n_jobs=1)
+    
+    result = {
+        'model': name,
+        'test_r2': r2,
+        'test_mae': mae,
+        'test_rmse': rmse,
+        'cv_r2_mean': cv_scores.mean(),
+        'cv_r2_std': cv_scores.std()
+    }
+    return result, model, y_pred
 
 def evaluate_models(X, y):
     """Evaluate multiple ML models"""
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor, HistGradientBoostingRegressor
+    from sklearn.linear_model import LinearRegression, Ridge, Lasso
+    
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     
     # Scale features
@@ -103,54 +135,52 @@ def evaluate_models(X, y):
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
     
+    # Estimators stay single-job; the parallelism is one worker per model below
     models = {
         'Linear Regression': (LinearRegression(), True),
         'Ridge Regression': (Ridge(alpha=1.0), True),
         'Lasso Regression': (Lasso(alpha=1.0), True),
-        'Random Forest': (RandomForestRegressor(n_estimators=100, random_state=42), False),
-        'Gradient Boosting': (GradientBoostingRegressor(n_estimators=100, random_state=42), False)
+        'Random Forest': (RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=1), False),
+        'Gradient Boosting': (GradientBoostingRegressor(n_estimators=100, random_state=42), False),
+        'Hist Gradient Boosting': (HistGradientBoostingRegressor(max_iter=200, random_state=42), False)
     }
     
+    # Fit every model in its own worker
+    fitted = Parallel(n_jobs=min(len(models), os.cpu_count() or 1), backend='loky')(
+        delayed(_fit_eval)(
+            name, model,
+            X_train_scaled if use_scaling else X_train,
+            X_test_scaled if use_scaling else X_test,
+            y_train, y_test
+        )
+        for name, (model, use_scaling) in models.items()
+    )
+    
     results = []
+    fitted_models = {}
     best_model = None
     best_score = -np.inf
     
-    for name, (model, use_scaling) in models.items():
-        # Choose data
-        X_tr = X_train_scaled if use_scaling else X_train
-        X_te = X_test_scaled if use_scaling else X_test
-        
-        # Fit and predict
-        model.fit(X_tr, y_train)
-        y_pred = model.predict(X_te)
-        
-        # Metrics
-        r2 = r2_score(y_test, y_pred)
-        mae = mean_absolute_error(y_test, y_pred)
-        rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-        
-        # Cross-validation
-        cv_scores = cross_val_score(model, X_tr, y_train, cv=5, scoring='r2')
-        
-        results.append({
-            'model': name,
-            'test_r2': r2,
-            'test_mae': mae,
-            'test_rmse': rmse,
-            'cv_r2_mean': cv_scores.mean(),
-            'cv_r2_std': cv_scores.std()
-        })
+    for (name, (_, use_scaling)), (result, model, y_pred) in zip(models.items(), fitted):
+        results.append(result)
+        fitted_models[name] = model
         
-        if r2 > best_score:
-            best_score = r2
+        if result['test_r2'] > best_score:
+            best_score = result['test_r2']
+            X_te = X_test_scaled if use_scaling else X_test
             best_model = (name, model, X_te, y_test, y_pred)
     
-    return results, best_model
+    return results, best_model, fitted_models
 
-def analyze_feature_importance(X, y):
+def analyze_feature_importance(X, y, rf_model=None):
     """Analyze feature importance"""
-    rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
-    rf_model.fit(X, y)
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.feature_selection import mutual_info_regression
+    
+    # Reuse the forest already fitted during model evaluation when available
+    if rf_model is None:
+        rf_model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
+        rf_model.fit(X, y)
     
     feature_importance = pd.DataFrame({
         'feature': X.columns,
@@ -166,27 +196,87 @@ def analyze_feature_importance(X, y):
     
     return feature_importance, mi_df
 
-def market_analysis(df):
-    """Perform market structure analysis"""
+def _sql_median(conn, column, where="1", params=()):
+    """Median of a vehicles_clean column computed inside SQLite"""
+    # Middle row (odd count) or average of the middle pair (even count), NULLs excluded like pandas
+    count_sql = f"SELECT COUNT({column}) FROM vehicles_clean WHERE {where}"
+    query = f"""
+        SELECT AVG({column}) FROM (
+            SELECT {column} FROM vehicles_clean
+            WHERE {column} IS NOT NULL AND {where}
+            ORDER BY {column}
+            LIMIT 2 - ({count_sql}) % 2
+            OFFSET (({count_sql}) - 1) / 2
+        )
+    """
+    value = conn.execute(query, tuple(params) * 3).fetchone()[0]
+    return float(value) if value is not None else float('nan')
+
+def _market_analysis_sql(conn):
+    """Market structure KPIs aggregated inside SQLite"""
+    total, price_min, price_max, price_mean, luxury_count, automatic_count = conn.execute("""
+        SELECT COUNT(*), MIN(price_usd), MAX(price_usd), AVG(price_usd),
+               TOTAL(is_luxury = 1), TOTAL(transmission = 'Automática')
+        FROM vehicles_clean
+    """).fetchone()
+    top_brands = conn.execute("""
+        SELECT brand, COUNT(*) FROM vehicles_clean
+        WHERE brand IS NOT NULL
+        GROUP BY brand ORDER BY COUNT(*) DESC LIMIT 5
+    """).fetchall()
+    
+    analysis = {
+        'total_vehicles': total,
+        'price_range': {
+            'min': float(price_min),
+            'max': float(price_max),
+            'median': _sql_median(conn, 'price_usd'),
+            'mean': float(price_mean)
+        },
+        'market_leader': top_brands[0][0],
+        'market_share': float(top_brands[0][1] / total * 100),
+        'luxury_percentage': float(luxury_count / total * 100),
+        'automatic_percentage': float(automatic_count / total * 100),
+        'median_age': _sql_median(conn, 'vehicle_age'),
+        'top_brands': dict(top_brands)
+    }
+    
+    # Luxury premium
+    luxury_median = _sql_median(conn, 'price_usd', 'is_luxury = ?', (1,))
+    regular_median = _sql_median(conn, 'price_usd', 'is_luxury = ?', (0,))
+    analysis['luxury_premium'] = float((luxury_median / regular_median - 1) * 100)
+    
+    return analysis
+
+def market_analysis(df=None, conn=None):
+    """Perform market structure analysis (in SQLite when a connection is given)"""
+    if conn is not None:
+        return _market_analysis_sql(conn)
+    
+    # Count brands and build the luxury mask once, then slice
+    brand_counts = df['brand'].value_counts()
+    luxury_mask = df['is_luxury'] == True
+    prices = df['price_usd']
+    
     analysis = {
         'total_vehicles': len(df),
         'price_range': {
-            'min': float(df['price_usd'].min()),
-            'max': float(df['price_usd'].max()),
-            'median': float(df['price_usd'].median()),
-            'mean': float(df['price_usd'].mean())
+            'min': float(prices.min()),
+            'max': float(prices.max()),
+            'median': float(prices.median()),
+            'mean': float(prices.mean())
         },
-        'market_leader': df['brand'].value_counts().index[0],
-        'market_share': float(df['brand'].value_counts().iloc[0] / len(df) * 100),
-        'luxury_percentage': float(df['is_luxury'].sum() / len(df) * 100),
+        'market_leader': brand_counts.index[0],
+        'market_share': float(brand_counts.iloc[0] / len(df) * 100),
+        'luxury_percentage': float(luxury_mask.mean() * 100),
         'automatic_percentage': float((df['transmission'] == 'Automática').sum() / len(df) * 100),
         'median_age': float(df['vehicle_age'].median()),
-        'top_brands': df['brand'].value_counts().head(5).to_dict()
+        'top_brands': brand_counts.head(5).to_dict()
     }
     
     # Luxury premium
-    luxury_median = df[df['is_luxury'] == True]['price_usd'].median()
-    regular_median = df[df['is_luxury'] == False]['price_usd'].median()
+    luxury_median = prices[luxury_mask].median()
+    regular_median = prices[~luxury_mask].median()
     analysis['luxury_premium'] = float((luxury_median / regular_median - 1) * 100)
     
     return analysis
@@ -239,20 +329,21 @@ def main():
     df_features = engineer_features(df)
     
     # Prepare ML data
-    X, y = prepare_ml_data(df_features)
+    X, y, _ = prepare_ml_data(df_features)
     print(f"Prepared {X.shape[1]} features for ML")
     
     # Evaluate models
     print("\nEvaluating ML models...")
-    results, best_model_info = evaluate_models(X, y)
+    results, best_model_info, fitted_models = evaluate_models(X, y)
     
     # Feature importance
     print("Analyzing feature importance...")
-    feature_importance, mi_df = analyze_feature_importance(X, y)
+    feature_importance, mi_df = analyze_feature_importance(X, y, fitted_models['Random Forest'])
     
     # Market analysis
     print("Performing market analysis...")
-    market_stats = market_analysis(df_features)
+    with sqlite3.connect(project_root / "data" / "vehicles_clean.db") as conn:
+        market_stats = market_analysis(conn=conn)
     
     # Generate recommendations
     print("Generating recommendations...")
@@ -8,12 +8,15 @@ class Settings(BaseSettings):
     PROJECT_ROOT: ClassVar[Path] = Path(__file__).parent.parent
     RAW_DATA_PATH: ClassVar[Path] = PROJECT_ROOT / "raw_data"
     LOGS_PATH: ClassVar[Path] = PROJECT_ROOT / "logs"
+    HTTP_CACHE_PATH: ClassVar[Path] = PROJECT_ROOT / "data" / "http_cache.sqlite"
     
     # Database
     DATABASE_URL: str = "sqlite:///vehicles.db"
     
     # Scraping settings
-    SCRAPE_DELAY: int = 1
+    SCRAPE_WORKERS: int = 8
+    # Matches the old fixed 2 s sleep between vehicle pages
+    SCRAPE_MAX_RPS: float = 0.5
     USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     
     # ETL settings
@@ -23,5 +26,7 @@ class Settings(BaseSettings):
     
     class Config:
         env_file = ".env"
+        # Older .env files still carry retired keys such as SCRAPE_DELAY
+        extra = "ignore"
 
 settings = Settings()
\ No newline at end of file
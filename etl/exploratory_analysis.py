@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 from datetime import datetime
 import re
+import warnings
 
 class VehicleDataAnalyzer:
     def __init__(self, db_path: str = "../scrapers/vehicles.db"):
@@ -21,50 +22,51 @@ class VehicleDataAnalyzer:
         """Comprehensive data quality analysis"""
         df = self.df
         
-        # Basic info
+        # Basic info (shallow memory estimate, deep=True would walk every string object)
         basic_info = {
             'total_records': len(df),
             'total_columns': len(df.columns),
-            'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024**2
+            'memory_usage_mb': df.memory_usage(deep=False).sum() / 1024**2
         }
         
-        # Missing values analysis
-        missing_analysis = {}
-        for col in df.columns:
-            null_count = df[col].isnull().sum()
-            empty_strings = (df[col] == '').sum() if df[col].dtype == 'object' else 0
-            missing_analysis[col] = {
-                'null_count': int(null_count),
-                'null_percentage': round(null_count / len(df) * 100, 2),
-                'empty_strings': int(empty_strings),
-                'total_missing': int(null_count + empty_strings)
+        # Missing values analysis (all columns counted in one pass each)
+        null_counts = df.isnull().sum()
+        empty_counts = (df.select_dtypes(include=['object', 'category']) == '').sum().reindex(df.columns, fill_value=0)
+        missing_analysis = {
+            col: {
+                'null_count': int(null_counts[col]),
+                'null_percentage': round(null_counts[col] / len(df) * 100, 2),
+                'empty_strings': int(empty_counts[col]),
+                'total_missing': int(null_counts[col] + empty_counts[col])
             }
+            for col in df.columns
+        }
         
         # Data type analysis
         dtype_analysis = {col: str(dtype) for col, dtype in df.dtypes.items()}
         
         # Unique values analysis
-        unique_analysis = {}
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                unique_count = df[col].nunique()
-                unique_analysis[col] = {
-                    'unique_count': int(unique_count),
-                    'sample_values': df[col].dropna().unique()[:10].tolist()
-                }
+        object_cols = df.select_dtypes(include=['object', 'category']).columns
+        unique_counts = df[object_cols].nunique()
+        unique_analysis = {
+            col: {
+                'unique_count': int(unique_counts[col]),
+                'sample_values': df[col].dropna().unique()[:10].tolist()
+            }
+            for col in object_cols
+        }
         
         # Numeric columns analysis
+        numeric_df = df.select_dtypes(include=[np.number])
+        numeric_stats = numeric_df.agg(['min', 'max', 'mean', 'median', 'std']).to_dict()
+        outlier_counts = self._count_outliers_columns(numeric_df)
         numeric_analysis = {}
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
+        for col, stats in numeric_stats.items():
             numeric_analysis[col] = {
-                'min': float(df[col].min()) if not pd.isna(df[col].min()) else None,
-                'max': float(df[col].max()) if not pd.isna(df[col].max()) else None,
-                'mean': float(df[col].mean()) if not pd.isna(df[col].mean()) else None,
-                'median': float(df[col].median()) if not pd.isna(df[col].median()) else None,
-                'std': float(df[col].std()) if not pd.isna(df[col].std()) else None,
-                'outliers_count': int(self._count_outliers(df[col]))
+                stat: None if pd.isna(value) else float(value)
+                for stat, value in stats.items()
             }
+            numeric_analysis[col]['outliers_count'] = outlier_counts[col]
         
         self.analysis_results = {
             'basic_info': basic_info,
@@ -79,16 +81,27 @@ class VehicleDataAnalyzer:
     
     def _count_outliers(self, series):
         """Count outliers using IQR method"""
-        if series.dtype not in [np.number] or series.isnull().all():
+        if not pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
             return 0
         
-        Q1 = series.quantile(0.25)
-        Q3 = series.quantile(0.75)
+        return self._count_outliers_columns(series.to_frame())[series.name]
+    
+    def _count_outliers_columns(self, numeric_df):
+        """Count IQR outliers for every numeric column in one matrix pass"""
+        if numeric_df.empty:
+            return {col: 0 for col in numeric_df.columns}
+        
+        mat = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+        # All-NaN columns yield NaN quartiles, which compare False and count 0
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            Q1, Q3 = np.nanpercentile(mat, [25.0, 75.0], axis=0)
         IQR = Q3 - Q1
         lower_bound = Q1 - 1.5 * IQR
         upper_bound = Q3 + 1.5 * IQR
         
-        return ((series < lower_bound) | (series > upper_bound)).sum()
+        counts = np.count_nonzero((mat < lower_bound) | (mat > upper_bound), axis=0)
+        return {col: int(count) for col, count in zip(numeric_df.columns, counts)}
     
     def identify_data_issues(self):
         """Identify specific data quality issues"""
@@ -134,7 +147,10 @@ class VehicleDataAnalyzer:
         # Description quality
         desc_issues = []
         if 'description' in df.columns:
-            generic_desc = df[df['description'].str.contains('Copyright|Todos los derechos', na=False)]
+            # Plain substring checks instead of a regex alternation
+            desc = df['description'].fillna('')
+            generic_mask = desc.str.contains('Copyright', regex=False) | desc.str.contains('Todos los derechos', regex=False)
+            generic_desc = df[generic_mask]
             desc_issues.append(f"Generic descriptions: {len(generic_desc)} records")
         
         issues = {
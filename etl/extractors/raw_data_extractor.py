@@ -1,6 +1,9 @@
 import sqlite3
 import pandas as pd
 from pathlib import Path
+from datetime import datetime, timedelta
+from contextlib import closing
+from typing import Iterator, Optional, Union
 
 class RawDataExtractor:
     def __init__(self, db_path: str = None):
@@ -16,11 +19,22 @@ class RawDataExtractor:
             query = "SELECT * FROM vehicles"
             return pd.read_sql_query(query, conn)
     
-    def extract_recent_vehicles(self, hours: int = 24) -> pd.DataFrame:
-        """Extract vehicles scraped in the last N hours"""
+    def _iter_query(self, query: str, chunksize: int, params: tuple = ()) -> Iterator[pd.DataFrame]:
+        """Yield query results chunk by chunk, keeping the connection open until exhausted"""
+        with closing(sqlite3.connect(self.db_path)) as conn:
+            yield from pd.read_sql_query(query, conn, params=params, chunksize=chunksize)
+    
+    def extract_recent_vehicles(self, hours: int = 24, chunksize: Optional[int] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """Extract vehicles scraped in the last N hours, streamed in chunks when chunksize is set"""
+        # scraped_at is stored as a local-time ISO string, so a bound ISO cutoff compares
+        # lexically and lets SQLite range-scan the scraped_at index
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        query = """
+        SELECT * FROM vehicles 
+        WHERE scraped_at >= ?
+        """
+        if chunksize:
+            return self._iter_query(query, chunksize, params=(cutoff,))
+        
         with sqlite3.connect(self.db_path) as conn:
-            query = """
-            SELECT * FROM vehicles 
-            WHERE datetime(scraped_at) >= datetime('now', '-{} hours')
-            """.format(hours)
-            return pd.read_sql_query(query, conn)
\ No newline at end of file
+            return pd.read_sql_query(query, conn, params=(cutoff,))
\ No newline at end of file
@@ -3,6 +3,19 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+def _upsert_on_url(table, conn, keys, data_iter):
+    """to_sql insert method that updates a listing's existing row (matched by url) in place"""
+    columns = ", ".join(f'"{key}"' for key in keys)
+    placeholders = ", ".join("?" * len(keys))
+    # Re-scraped listings come back from the raw table under a new id, so url is the key
+    updates = ", ".join(f'"{key}" = excluded."{key}"' for key in keys if key != 'url')
+    conn.executemany(
+        f"INSERT INTO {table.name} ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT(url) DO UPDATE SET {updates}, processed_at = CURRENT_TIMESTAMP",
+        list(data_iter)
+    )
+    return conn.rowcount
+
 class CleanDataLoader:
     def __init__(self, db_path: str = None):
         if db_path is None:
@@ -11,25 +24,36 @@ class CleanDataLoader:
         else:
             self.db_path = Path(db_path)
     
-    def create_clean_schema(self):
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for bulk writes"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-200000")
+        return conn
+    
+    def create_clean_table(self, drop_existing: bool = True):
         """Create optimized schema for clean data"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # Drop existing table if it exists
-            cursor.execute("DROP TABLE IF EXISTS vehicles_clean")
+            if drop_existing:
+                cursor.execute("DROP TABLE IF EXISTS vehicles_clean")
             
-            # Create clean vehicles table
+            # Create clean vehicles table. One row per listing url; the other columns stay
+            # nullable so partially scraped listings are still stored
             cursor.execute("""
-                CREATE TABLE vehicles_clean (
+                CREATE TABLE IF NOT EXISTS vehicles_clean (
                     id INTEGER PRIMARY KEY,
                     url TEXT UNIQUE NOT NULL,
-                    vehicle_id TEXT UNIQUE NOT NULL,
-                    brand TEXT NOT NULL,
+                    vehicle_id TEXT,
+                    brand TEXT,
                     model TEXT,
                     year INTEGER,
-                    price_colones INTEGER NOT NULL,
-                    price_usd INTEGER NOT NULL,
+                    price_colones INTEGER,
+                    price_usd INTEGER,
                     mileage REAL,
                     fuel_type TEXT,
                     transmission TEXT,
@@ -51,57 +75,74 @@ class CleanDataLoader:
                 )
             """)
             
+            conn.commit()
+    
+    def create_indexes(self):
+        """Create query indexes and refresh statistics once all data is loaded"""
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            
             # Create indexes for better query performance
-            cursor.execute("CREATE INDEX idx_brand ON vehicles_clean(brand)")
-            cursor.execute("CREATE INDEX idx_year ON vehicles_clean(year)")
-            cursor.execute("CREATE INDEX idx_price_usd ON vehicles_clean(price_usd)")
-            cursor.execute("CREATE INDEX idx_fuel_type ON vehicles_clean(fuel_type)")
-            cursor.execute("CREATE INDEX idx_is_luxury ON vehicles_clean(is_luxury)")
-            cursor.execute("CREATE INDEX idx_scraped_at ON vehicles_clean(scraped_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_brand ON vehicles_clean(brand)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_year ON vehicles_clean(year)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_usd ON vehicles_clean(price_usd)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_fuel_type ON vehicles_clean(fuel_type)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_is_luxury ON vehicles_clean(is_luxury)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_scraped_at ON vehicles_clean(scraped_at)")
+            # Serves the dashboard's brand + price range filter
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_brand_price ON vehicles_clean(brand, price_usd)")
             
-            conn.commit()
+            # Refresh planner statistics
+            cursor.execute("ANALYZE vehicles_clean")
     
     def load_clean_data(self, df: pd.DataFrame, mode: str = 'replace'):
-        """Load cleaned data to database"""
-        self.create_clean_schema()
+        """Load cleaned data to database; append mode expects the table to exist already"""
+        # Schema and index setup stay out of the per-chunk path: callers run create_clean_table
+        # before appending chunks and create_indexes once after the last one
+        if mode == 'replace':
+            self.create_clean_table()
         
-        with sqlite3.connect(self.db_path) as conn:
-            if mode == 'replace':
-                df.to_sql('vehicles_clean', conn, if_exists='replace', index=False)
-            elif mode == 'append':
-                df.to_sql('vehicles_clean', conn, if_exists='append', index=False)
+        # One transaction for the whole load, rows sent in executemany batches
+        with self._connect() as conn:
+            # Insert into the typed schema instead of letting to_sql recreate it with inferred types
+            table_columns = [col[1] for col in conn.execute("PRAGMA table_info(vehicles_clean)")]
+            
+            df = df[[col for col in df.columns if col in table_columns]]
+            df.to_sql('vehicles_clean', conn, if_exists='append', index=False,
+                      chunksize=5000, method=_upsert_on_url)
     
     def get_data_quality_stats(self) -> dict:
         """Get data quality statistics for the clean database"""
         with sqlite3.connect(self.db_path) as conn:
             stats = {}
             
-            # Basic counts
-            stats['total_records'] = pd.read_sql_query(
-                "SELECT COUNT(*) as count FROM vehicles_clean", conn
-            ).iloc[0]['count']
-            
-            # Missing data percentages
-            missing_query = """
+            # Counts, missing data percentages and price flags in one scan
+            (stats['total_records'], model_missing, year_missing, mileage_missing,
+             fuel_missing, engine_missing, stats['price_issues']) = conn.execute("""
                 SELECT 
-                    SUM(CASE WHEN model IS NULL THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as model_missing,
-                    SUM(CASE WHEN year IS NULL THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as year_missing,
-                    SUM(CASE WHEN mileage IS NULL THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as mileage_missing,
-                    SUM(CASE WHEN fuel_type IS NULL THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as fuel_missing,
-                    SUM(CASE WHEN engine_cc IS NULL THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as engine_missing
+                    COUNT(*),
+                    AVG(model IS NULL) * 100.0,
+                    AVG(year IS NULL) * 100.0,
+                    AVG(mileage IS NULL) * 100.0,
+                    AVG(fuel_type IS NULL) * 100.0,
+                    AVG(engine_cc IS NULL) * 100.0,
+                    IFNULL(SUM(price_flag = 1), 0)
                 FROM vehicles_clean
-            """
-            stats['missing_percentages'] = pd.read_sql_query(missing_query, conn).to_dict('records')[0]
-            
-            # Price flags
-            stats['price_issues'] = pd.read_sql_query(
-                "SELECT COUNT(*) as count FROM vehicles_clean WHERE price_flag = 1", conn
-            ).iloc[0]['count']
+            """).fetchone()
+            stats['missing_percentages'] = {
+                'model_missing': model_missing,
+                'year_missing': year_missing,
+                'mileage_missing': mileage_missing,
+                'fuel_missing': fuel_missing,
+                'engine_missing': engine_missing
+            }
             
             # Brand distribution
-            stats['brand_distribution'] = pd.read_sql_query(
-                "SELECT brand, COUNT(*) as count FROM vehicles_clean GROUP BY brand ORDER BY count DESC LIMIT 10", 
-                conn
-            ).to_dict('records')
+            stats['brand_distribution'] = [
+                {'brand': brand, 'count': count}
+                for brand, count in conn.execute(
+                    "SELECT brand, COUNT(*) as count FROM vehicles_clean GROUP BY brand ORDER BY count DESC LIMIT 10"
+                )
+            ]
             
-            return stats
\ No newline at end of file
+            return stats
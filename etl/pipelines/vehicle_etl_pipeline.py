@@ -29,7 +29,7 @@ class VehicleETLPipeline:
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(log_dir / f"etl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"),
+                logging.FileHandler(log_dir / f"etl_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log", delay=True),
                 logging.StreamHandler()
             ]
         )
@@ -43,7 +43,7 @@ class VehicleETLPipeline:
             # Extract
             self.logger.info("Extracting raw data...")
             raw_data = self.extractor.extract_all_vehicles()
-            self.logger.info(f"Extracted {len(raw_data)} records")
+            self.logger.info("Extracted %d records", len(raw_data))
             
             if raw_data.empty:
                 self.logger.warning("No data to process")
@@ -57,7 +57,7 @@ class VehicleETLPipeline:
             # Transform
             self.logger.info("Cleaning and transforming data...")
             clean_data = self.cleaner.clean_data(raw_data)
-            self.logger.info(f"Cleaned data: {len(clean_data)} records")
+            self.logger.info("Cleaned data: %d records", len(clean_data))
             
             # Validate clean data
             self.logger.info("Validating cleaned data...")
@@ -67,6 +67,7 @@ class VehicleETLPipeline:
             # Load
             self.logger.info("Loading clean data...")
             self.loader.load_clean_data(clean_data, mode='replace')
+            self.loader.create_indexes()
             
             # Quality check
             self.logger.info("Generating quality report...")
@@ -77,63 +78,67 @@ class VehicleETLPipeline:
             return stats
             
         except Exception as e:
-            self.logger.error(f"ETL pipeline failed: {str(e)}")
+            self.logger.error("ETL pipeline failed: %s", e)
             raise
     
-    def run_incremental_pipeline(self, hours: int = 24):
+    def run_incremental_pipeline(self, hours: int = 24, chunksize: int = 50000):
         """Run incremental ETL for recent data"""
         try:
-            self.logger.info(f"Starting incremental ETL for last {hours} hours...")
+            self.logger.info("Starting incremental ETL for last %s hours...", hours)
             
-            # Extract recent data
-            raw_data = self.extractor.extract_recent_vehicles(hours)
-            self.logger.info(f"Extracted {len(raw_data)} recent records")
+            # Extract recent data in chunks so only one chunk is in memory at a time
+            self.loader.create_clean_table(drop_existing=False)
+            extracted = 0
+            for raw_data in self.extractor.extract_recent_vehicles(hours, chunksize=chunksize):
+                extracted += len(raw_data)
+                
+                # Transform
+                clean_data = self.cleaner.clean_data(raw_data)
+                
+                # Load (append mode for incremental)
+                self.loader.load_clean_data(clean_data, mode='append')
             
-            if raw_data.empty:
+            self.logger.info("Extracted %d recent records", extracted)
+            
+            if extracted == 0:
                 self.logger.info("No new data to process")
                 return
             
-            # Transform
-            clean_data = self.cleaner.clean_data(raw_data)
-            
-            # Load (append mode for incremental)
-            self.loader.load_clean_data(clean_data, mode='append')
+            # Indexes and planner statistics once for the whole run, not per chunk
+            self.loader.create_indexes()
             
             self.logger.info("Incremental ETL completed successfully")
             
         except Exception as e:
-            self.logger.error(f"Incremental ETL failed: {str(e)}")
+            self.logger.error("Incremental ETL failed: %s", e)
             raise
     
     def log_quality_stats(self, stats: dict):
         """Log data quality statistics"""
         self.logger.info("=== DATA QUALITY REPORT ===")
-        self.logger.info(f"Total records: {stats['total_records']}")
-        self.logger.info(f"Price issues: {stats['price_issues']}")
+        self.logger.info("Total records: %s", stats['total_records'])
+        self.logger.info("Price issues: %s", stats['price_issues'])
         
         self.logger.info("Missing data percentages:")
         for field, percentage in stats['missing_percentages'].items():
-            self.logger.info(f"  {field}: {percentage:.2f}%")
+            self.logger.info("  %s: %.2f%%", field, percentage)
         
         self.logger.info("Top brands:")
         for brand_info in stats['brand_distribution'][:5]:
-            self.logger.info(f"  {brand_info['brand']}: {brand_info['count']} vehicles")
+            self.logger.info("  %s: %s vehicles", brand_info['brand'], brand_info['count'])
     
     def log_validation_report(self, report: dict, title: str = "RAW DATA"):
         """Log validation report"""
-        self.logger.info(f"=== {title} VALIDATION ====")
-        self.logger.info(f"Total records: {report['total_records']}")
-        self.logger.info(f"Validation passed: {report['passed_validation']}")
+        self.logger.info("=== %s VALIDATION ====", title)
+        self.logger.info("Total records: %s", report['total_records'])
+        self.logger.info("Validation passed: %s", report['passed_validation'])
         
         if report['validation_errors']:
-            self.logger.error("Validation errors:")
-            for error in report['validation_errors']:
-                self.logger.error(f"  {error}")
+            # One record per section instead of one per line
+            self.logger.error("Validation errors:\n%s", "\n".join(f"  {error}" for error in report['validation_errors']))
         
         if report['warnings']:
-            self.logger.warning("Validation warnings:")
-            for warning in report['warnings']:
-                self.logger.warning(f"  {warning}")
+            self.logger.warning("Validation warnings:\n%s", "\n".join(f"  {warning}" for warning in report['warnings']))
 
 if __name__ == "__main__":
     pipeline = VehicleETLPipeline()
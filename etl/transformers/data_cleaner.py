@@ -3,6 +3,45 @@ import numpy as np
 import re
 from typing import Dict, Any
 
+COLOR_MAPPING = {
+    'negro': 'Black',
+    'blanco': 'White',
+    'gris': 'Gray',
+    'azul': 'Blue',
+    'rojo': 'Red',
+    'plateado': 'Silver',
+    'café': 'Brown',
+    'vino': 'Burgundy'
+}
+_COLOR_PATTERN = re.compile('|'.join(map(re.escape, COLOR_MAPPING)))
+
+# Valid (low, high, inclusive) ranges; values outside become None
+NUMERIC_BOUNDS = {
+    # Based on analysis: years < 1950 or > 2026 are invalid
+    'year': (1950, 2026, 'both'),
+    # 0 mileage is likely missing data for used cars, >500k likely a data entry error
+    'mileage': (0, 500000, 'right'),
+    # Based on analysis: 18 outliers
+    'engine_cc': (500, 6000, 'both')
+}
+
+CATEGORICAL_COLUMNS = ['brand', 'fuel_type', 'transmission', 'color_exterior', 'color_interior']
+
+LUXURY_BRANDS = frozenset(['BMW', 'Mercedes-Benz', 'Audi', 'Porsche', 'Lexus', 'Jaguar', 'Land Rover'])
+
+def _map_unique(series: pd.Series, transform) -> pd.Series:
+    """Run a string transform on the distinct values only and broadcast the result back"""
+    codes, uniques = pd.factorize(series)
+    cleaned = transform(pd.Series(uniques, dtype=object))
+    # Missing values have code -1, which reindexes to NaN
+    return pd.Series(cleaned.reindex(codes).to_numpy(), index=series.index)
+
+def _normalize_colors(colors: pd.Series) -> pd.Series:
+    """Lowercase, translate Spanish color names in a single regex pass, and title-case"""
+    colors = colors.str.lower().str.strip()
+    colors = colors.str.replace(_COLOR_PATTERN, lambda m: COLOR_MAPPING[m.group(0)].lower(), regex=True)
+    return colors.str.title()
+
 class DataCleaner:
     def __init__(self):
         self.brand_mapping = {
@@ -15,7 +54,12 @@ class DataCleaner:
         
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply all cleaning transformations"""
-        df = df.copy()
+        # Shallow copy: every cleaning step replaces whole columns instead of writing into them,
+        # so the caller's frame is never mutated and untouched columns aren't duplicated
+        df = df.copy(deep=False)
+        
+        # Listings are keyed by url in the clean table
+        df = self._drop_rows_without_url(df)
         
         # Remove completely empty columns
         df = self._remove_empty_columns(df)
@@ -24,18 +68,25 @@ class DataCleaner:
         df = self._clean_brands(df)
         df = self._clean_models(df)
         df = self._clean_fuel_types(df)
-        df = self._clean_years(df)
-        df = self._clean_mileage(df)
-        df = self._clean_engine_cc(df)
+        df = self._clean_numeric_ranges(df)
         df = self._clean_colors(df)
         df = self._validate_prices(df)
         df = self._clean_phone_numbers(df)
         
+        # Low-cardinality text columns become categoricals so isin/groupby work on integer codes
+        df = self._categorize_columns(df)
+        
         # Add derived features
         df = self._add_derived_features(df)
         
         return df
     
+    def _drop_rows_without_url(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove rows that have no listing url to key them by"""
+        if 'url' in df.columns:
+            df = df[df['url'].notna()]
+        return df
+    
     def _remove_empty_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Remove columns that are 100% empty"""
         # Based on analysis: doors, style, location, province, features are 100% empty
@@ -45,9 +96,10 @@ class DataCleaner:
     def _clean_brands(self, df: pd.DataFrame) -> pd.DataFrame:
         """Standardize brand names"""
         if 'brand' in df.columns:
-            df['brand'] = df['brand'].str.lower().str.strip()
-            df['brand'] = df['brand'].replace(self.brand_mapping)
-            df['brand'] = df['brand'].str.title()
+            df['brand'] = _map_unique(
+                df['brand'],
+                lambda s: s.str.lower().str.strip().replace(self.brand_mapping).str.title()
+            )
         return df
     
     def _clean_models(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -64,67 +116,40 @@ class DataCleaner:
     def _clean_fuel_types(self, df: pd.DataFrame) -> pd.DataFrame:
         """Standardize fuel types"""
         if 'fuel_type' in df.columns:
-            df['fuel_type'] = df['fuel_type'].replace('', None)
             fuel_mapping = {
                 'gasolina': 'Gasoline',
                 'diesel': 'Diesel',
                 'híbrido': 'Hybrid',
                 'hibrido': 'Hybrid'
             }
-            df['fuel_type'] = df['fuel_type'].str.lower().replace(fuel_mapping)
-        return df
-    
-    def _clean_years(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean and validate years"""
-        if 'year' in df.columns:
-            # Set invalid years to None (based on analysis: years < 1950 or > 2026)
-            df.loc[(df['year'] < 1950) | (df['year'] > 2026), 'year'] = None
-        return df
-    
-    def _clean_mileage(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean mileage data"""
-        if 'mileage' in df.columns:
-            # Handle extreme values (>500k might be data entry errors)
-            df.loc[df['mileage'] > 500000, 'mileage'] = None
-            # Convert 0 mileage to None for used cars (likely missing data)
-            df.loc[df['mileage'] == 0, 'mileage'] = None
+            df['fuel_type'] = _map_unique(
+                df['fuel_type'],
+                lambda s: s.replace('', None).str.lower().replace(fuel_mapping)
+            )
         return df
     
-    def _clean_engine_cc(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Clean engine displacement"""
-        if 'engine_cc' in df.columns:
-            # Handle outliers (based on analysis: 18 outliers)
-            df.loc[(df['engine_cc'] < 500) | (df['engine_cc'] > 6000), 'engine_cc'] = None
+    def _clean_numeric_ranges(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Set out-of-range years, mileage and engine sizes to None"""
+        for col, (low, high, inclusive) in NUMERIC_BOUNDS.items():
+            if col in df.columns:
+                df[col] = df[col].where(df[col].between(low, high, inclusive=inclusive))
         return df
     
     def _clean_colors(self, df: pd.DataFrame) -> pd.DataFrame:
         """Standardize color names"""
-        color_mapping = {
-            'negro': 'Black',
-            'blanco': 'White',
-            'gris': 'Gray',
-            'azul': 'Blue',
-            'rojo': 'Red',
-            'plateado': 'Silver',
-            'café': 'Brown',
-            'vino': 'Burgundy'
-        }
-        
         for col in ['color_exterior', 'color_interior']:
             if col in df.columns:
-                df[col] = df[col].str.lower().str.strip()
-                for spanish, english in color_mapping.items():
-                    df[col] = df[col].str.replace(spanish, english.lower())
-                df[col] = df[col].str.title()
+                # Cleaned once per distinct color rather than once per row
+                df[col] = _map_unique(df[col], _normalize_colors)
         return df
     
     def _validate_prices(self, df: pd.DataFrame) -> pd.DataFrame:
         """Validate price consistency"""
         if 'price_colones' in df.columns and 'price_usd' in df.columns:
-            # Calculate exchange rate
-            df['exchange_rate'] = df['price_colones'] / df['price_usd']
-            # Flag suspicious exchange rates (not between 400-600)
-            df['price_flag'] = (df['exchange_rate'] < 400) | (df['exchange_rate'] > 600)
+            # Calculate exchange rate and flag suspicious ones (not between 400-600);
+            # eval runs through numexpr in blocks when it is installed
+            df['exchange_rate'] = df.eval('price_colones / price_usd')
+            df['price_flag'] = df.eval('(exchange_rate < 400) | (exchange_rate > 600)')
         return df
     
     def _clean_phone_numbers(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -133,20 +158,26 @@ class DataCleaner:
             df['seller_phone'] = df['seller_phone'].str.replace(r'[^\d-]', '', regex=True)
         return df
     
+    def _categorize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Store low-cardinality text columns as categoricals"""
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        return df
+    
     def _add_derived_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add useful derived features"""
-        # Vehicle age
+        # Vehicle age, and price per year (depreciation indicator) from the same float age
+        # so the nullable Int16 column doesn't have to be cast back
         if 'year' in df.columns:
             current_year = pd.Timestamp.now().year
-            df['vehicle_age'] = current_year - df['year']
-        
-        # Price per year (depreciation indicator)
-        if 'price_usd' in df.columns and 'vehicle_age' in df.columns:
-            df['price_per_year'] = df['price_usd'] / (df['vehicle_age'] + 1)
+            age = current_year - df['year']
+            df['vehicle_age'] = age.astype('Int16')
+            if 'price_usd' in df.columns:
+                df['price_per_year'] = df['price_usd'] / (age + 1)
         
         # Luxury brand flag
         if 'brand' in df.columns:
-            luxury_brands = ['BMW', 'Mercedes-Benz', 'Audi', 'Porsche', 'Lexus', 'Jaguar', 'Land Rover']
-            df['is_luxury'] = df['brand'].isin(luxury_brands)
+            df['is_luxury'] = df['brand'].isin(LUXURY_BRANDS)
         
         return df
\ No newline at end of file
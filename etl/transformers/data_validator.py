@@ -33,11 +33,9 @@ class DataValidator:
                 report['warnings'].append(f"{field} has {null_count} null values")
         
         # Validate numeric ranges
-        for field, rules in self.validation_rules.items():
-            if field in df.columns:
-                invalid_count = self._validate_numeric_range(df, field, rules['min'], rules['max'])
-                if invalid_count > 0:
-                    report['warnings'].append(f"{field} has {invalid_count} values outside valid range")
+        for field, invalid_count in self._count_out_of_range(df).items():
+            if invalid_count > 0:
+                report['warnings'].append(f"{field} has {invalid_count} values outside valid range")
         
         # Check for duplicates
         if 'vehicle_id' in df.columns:
@@ -53,14 +51,14 @@ class DataValidator:
         
         return report
     
-    def _validate_numeric_range(self, df: pd.DataFrame, field: str, min_val: float, max_val: float) -> int:
-        """Count records outside valid numeric range"""
-        if field not in df.columns:
-            return 0
+    def _count_out_of_range(self, df: pd.DataFrame) -> pd.Series:
+        """Count records outside each field's valid numeric range in one frame-wide comparison"""
+        fields = [field for field in self.validation_rules if field in df.columns]
+        bounds = pd.DataFrame(self.validation_rules)[fields]
+        values = df[fields]
         
-        valid_data = df[field].dropna()
-        invalid_count = ((valid_data < min_val) | (valid_data > max_val)).sum()
-        return invalid_count
+        # NaN compares False on both sides, so missing values are never counted
+        return ((values < bounds.loc['min']) | (values > bounds.loc['max'])).sum()
     
     def _validate_price_consistency(self, df: pd.DataFrame) -> int:
         """Check price consistency between USD and Colones"""
@@ -72,11 +70,11 @@ class DataValidator:
         if len(valid_prices) == 0:
             return 0
         
-        exchange_rates = valid_prices['price_colones'] / valid_prices['price_usd']
+        exchange_rates = valid_prices.eval('price_colones / price_usd')
         
         # Count prices with suspicious exchange rates
         min_rate, max_rate = self.validation_rules['exchange_rate']['min'], self.validation_rules['exchange_rate']['max']
-        inconsistent = ((exchange_rates < min_rate) | (exchange_rates > max_rate)).sum()
+        inconsistent = (~exchange_rates.between(min_rate, max_rate)).sum()
         
         return inconsistent
     
@@ -91,35 +89,33 @@ class DataValidator:
             'categorical_summary': {}
         }
         
-        # Missing data analysis
-        for col in df.columns:
-            null_count = df[col].isnull().sum()
-            empty_strings = (df[col] == '').sum() if df[col].dtype == 'object' else 0
-            profile['missing_data'][col] = {
-                'null_count': int(null_count),
-                'null_percentage': round(null_count / len(df) * 100, 2),
-                'empty_strings': int(empty_strings),
-                'total_missing': int(null_count + empty_strings)
+        # Missing data analysis (all columns counted in one pass each)
+        null_counts = df.isnull().sum()
+        empty_counts = (df.select_dtypes(include=['object', 'category']) == '').sum().reindex(df.columns, fill_value=0)
+        profile['missing_data'] = {
+            col: {
+                'null_count': int(null_counts[col]),
+                'null_percentage': round(null_counts[col] / len(df) * 100, 2),
+                'empty_strings': int(empty_counts[col]),
+                'total_missing': int(null_counts[col] + empty_counts[col])
             }
+            for col in df.columns
+        }
         
         # Numeric columns summary
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            if not df[col].empty:
-                profile['numeric_summary'][col] = {
-                    'min': float(df[col].min()),
-                    'max': float(df[col].max()),
-                    'mean': float(df[col].mean()),
-                    'median': float(df[col].median()),
-                    'std': float(df[col].std())
-                }
+        if len(df):
+            numeric_stats = df.select_dtypes(include=[np.number]).agg(['min', 'max', 'mean', 'median', 'std'])
+            profile['numeric_summary'] = {
+                col: {stat: float(value) for stat, value in stats.items()}
+                for col, stats in numeric_stats.to_dict().items()
+            }
         
         # Categorical columns summary
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        categorical_cols = df.select_dtypes(include=['object', 'category']).columns
+        unique_counts = df[categorical_cols].nunique()
         for col in categorical_cols:
-            unique_count = df[col].nunique()
             profile['categorical_summary'][col] = {
-                'unique_count': int(unique_count),
+                'unique_count': int(unique_counts[col]),
                 'top_values': df[col].value_counts().head(5).to_dict()
             }
         
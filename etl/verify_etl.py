@@ -5,9 +5,12 @@ Compare raw vs clean data to show improvements
 """
 
 import sqlite3
-import pandas as pd
 from pathlib import Path
 
+def _table_columns(conn, table):
+    """Column names of a table, read from the schema instead of the rows"""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
 def compare_databases():
     """Compare raw and clean databases"""
     project_root = Path(__file__).parent.parent
@@ -17,54 +20,63 @@ def compare_databases():
     print("ETL Data Quality Comparison")
     print("=" * 50)
     
-    # Raw data stats
-    with sqlite3.connect(raw_db) as conn:
-        raw_df = pd.read_sql_query("SELECT * FROM vehicles", conn)
-    
-    # Clean data stats  
-    with sqlite3.connect(clean_db) as conn:
-        clean_df = pd.read_sql_query("SELECT * FROM vehicles_clean", conn)
-    
-    print(f"Raw database records: {len(raw_df)}")
-    print(f"Clean database records: {len(clean_df)}")
-    print(f"Raw database columns: {len(raw_df.columns)}")
-    print(f"Clean database columns: {len(clean_df.columns)}")
-    
-    print("\nColumns removed in cleaning:")
-    removed_cols = set(raw_df.columns) - set(clean_df.columns)
-    for col in removed_cols:
-        if col not in ['id']:  # id might be different
-            print(f"  - {col}")
-    
-    print("\nColumns added in cleaning:")
-    added_cols = set(clean_df.columns) - set(raw_df.columns)
-    for col in added_cols:
-        print(f"  + {col}")
-    
-    print("\nData quality improvements:")
-    
-    # Check brand standardization
-    if 'brand' in raw_df.columns and 'brand' in clean_df.columns:
-        raw_brands = raw_df['brand'].nunique()
-        clean_brands = clean_df['brand'].nunique()
-        print(f"  Brand standardization: {raw_brands} -> {clean_brands} unique brands")
-    
-    # Check missing data handling
-    common_cols = ['model', 'fuel_type', 'mileage', 'engine_cc']
-    for col in common_cols:
-        if col in raw_df.columns and col in clean_df.columns:
-            raw_missing = (raw_df[col].isnull() | (raw_df[col] == '')).sum()
-            clean_missing = clean_df[col].isnull().sum()
-            raw_pct = raw_missing / len(raw_df) * 100
-            clean_pct = clean_missing / len(clean_df) * 100
-            print(f"  {col} missing: {raw_pct:.1f}% -> {clean_pct:.1f}%")
-    
-    print("\nNew derived features:")
-    derived_features = ['vehicle_age', 'price_per_year', 'is_luxury', 'exchange_rate']
-    for feature in derived_features:
-        if feature in clean_df.columns:
-            non_null = clean_df[feature].notna().sum()
-            print(f"  {feature}: {non_null} records with values")
+    # Every statistic below is aggregated inside SQLite, so no table is loaded into memory
+    raw_conn = sqlite3.connect(raw_db)
+    clean_conn = sqlite3.connect(clean_db)
+    try:
+        raw_cols = _table_columns(raw_conn, 'vehicles')
+        clean_cols = _table_columns(clean_conn, 'vehicles_clean')
+        raw_count = raw_conn.execute("SELECT COUNT(*) FROM vehicles").fetchone()[0]
+        clean_count = clean_conn.execute("SELECT COUNT(*) FROM vehicles_clean").fetchone()[0]
+        
+        print(f"Raw database records: {raw_count}")
+        print(f"Clean database records: {clean_count}")
+        print(f"Raw database columns: {len(raw_cols)}")
+        print(f"Clean database columns: {len(clean_cols)}")
+        
+        print("\nColumns removed in cleaning:")
+        removed_cols = set(raw_cols) - set(clean_cols)
+        for col in removed_cols:
+            if col not in ['id']:  # id might be different
+                print(f"  - {col}")
+        
+        print("\nColumns added in cleaning:")
+        added_cols = set(clean_cols) - set(raw_cols)
+        for col in added_cols:
+            print(f"  + {col}")
+        
+        print("\nData quality improvements:")
+        
+        # Check brand standardization
+        if 'brand' in raw_cols and 'brand' in clean_cols:
+            raw_brands = raw_conn.execute("SELECT COUNT(DISTINCT brand) FROM vehicles").fetchone()[0]
+            clean_brands = clean_conn.execute("SELECT COUNT(DISTINCT brand) FROM vehicles_clean").fetchone()[0]
+            print(f"  Brand standardization: {raw_brands} -> {clean_brands} unique brands")
+        
+        # Check missing data handling
+        common_cols = ['model', 'fuel_type', 'mileage', 'engine_cc']
+        for col in common_cols:
+            if col in raw_cols and col in clean_cols:
+                raw_missing = raw_conn.execute(
+                    f"SELECT SUM({col} IS NULL OR {col} = '') FROM vehicles"
+                ).fetchone()[0] or 0
+                clean_missing = clean_conn.execute(
+                    f"SELECT SUM({col} IS NULL) FROM vehicles_clean"
+                ).fetchone()[0] or 0
+                # Empty tables report nan%, as the old pandas division did
+                raw_pct = raw_missing / raw_count * 100 if raw_count else float('nan')
+                clean_pct = clean_missing / clean_count * 100 if clean_count else float('nan')
+                print(f"  {col} missing: {raw_pct:.1f}% -> {clean_pct:.1f}%")
+        
+        print("\nNew derived features:")
+        derived_features = ['vehicle_age', 'price_per_year', 'is_luxury', 'exchange_rate']
+        for feature in derived_features:
+            if feature in clean_cols:
+                non_null = clean_conn.execute(f"SELECT COUNT({feature}) FROM vehicles_clean").fetchone()[0]
+                print(f"  {feature}: {non_null} records with values")
+    finally:
+        raw_conn.close()
+        clean_conn.close()
     
     print(f"\nClean database size: {clean_db.stat().st_size / 1024:.1f} KB")
     print(f"Raw database size: {raw_db.stat().st_size / 1024:.1f} KB")
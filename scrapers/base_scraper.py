@@ -5,23 +5,52 @@ from datetime import datetime
 from pathlib import Path
 from config.settings import settings
 
+# Fast JSON encoding (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTTP response caching with conditional GETs (optional)
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+def make_session() -> requests.Session:
+    """HTTP session with the configured User-Agent, cached at settings.HTTP_CACHE_PATH when requests-cache is installed"""
+    if REQUESTS_CACHE_AVAILABLE:
+        session = requests_cache.CachedSession(
+            str(settings.HTTP_CACHE_PATH), backend='sqlite', expire_after=3600,
+            stale_if_error=True, cache_control=True
+        )
+    else:
+        session = requests.Session()
+    session.headers.update({'User-Agent': settings.USER_AGENT})
+    return session
+
 class BaseScraper(ABC):
     def __init__(self, name: str):
         self.name = name
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': settings.USER_AGENT})
+        self.session = make_session()
     
     @abstractmethod
     def scrape(self) -> dict:
         pass
     
     def save_raw_data(self, data: dict, format: str = 'json'):
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Microseconds keep filenames unique when detail pages are saved back to back
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         filename = f"{self.name}_{timestamp}.{format}"
         
         if format == 'json':
             filepath = settings.RAW_DATA_PATH / 'json' / filename
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
+            if ORJSON_AVAILABLE:
+                filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, 'w') as f:
+                    json.dump(data, f, indent=2)
         
         return filepath
\ No newline at end of file
@@ -3,7 +3,11 @@ from typing import Optional, List
 from datetime import datetime
 import re
 
-@dataclass
+_SEPARATOR_TABLE = str.maketrans('', '', '.,')
+_DIGITS_RE = re.compile(r'\d+')
+_ID_RE = re.compile(r'c=(\d+)')
+
+@dataclass(slots=True)
 class Vehicle:
     url: str
     vehicle_id: str = ""
@@ -31,7 +35,7 @@ class Vehicle:
     
     def extract_id_from_url(self):
         """Extract vehicle ID from URL"""
-        match = re.search(r'c=(\d+)', self.url)
+        match = _ID_RE.search(self.url)
         if match:
             self.vehicle_id = match.group(1)
     
@@ -39,8 +43,9 @@ class Vehicle:
         """Extract numeric price from text"""
         if not price_text:
             return None
-        numbers = re.findall(r'[\d,]+', price_text.replace('.', '').replace(',', ''))
-        return int(numbers[0]) if numbers else None
+        # Drop thousands separators in one C-level pass, then take the first digit run
+        match = _DIGITS_RE.search(price_text.translate(_SEPARATOR_TABLE))
+        return int(match.group()) if match else None
     
     def normalize_brand(self):
         """Normalize brand name"""
@@ -1,9 +1,34 @@
 import sqlite3
+import os
 import json
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Dict
 import logging
 
+# Fast JSON decoding (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Columns written by the scrapers, in INSERT parameter order
+_COLUMNS = (
+    'url', 'vehicle_id', 'brand', 'model', 'year', 'price_colones', 'price_usd',
+    'mileage', 'fuel_type', 'transmission', 'engine_cc', 'doors', 'style',
+    'color_exterior', 'color_interior', 'location', 'province',
+    'seller_phone', 'seller_whatsapp', 'description', 'features', 'images',
+    'scraped_at'
+)
+_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO vehicles ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_COLUMNS))})"
+)
+
 class DatabaseManager:
     def __init__(self, db_path: str = None):
         if db_path is None:
@@ -13,11 +38,47 @@ class DatabaseManager:
         else:
             self.db_path = Path(db_path)
         self.logger = logging.getLogger(__name__)
+        
+        # One long-lived connection in autocommit mode; writes use explicit transactions
+        self._lock = threading.RLock()
+        self.conn = self._connect()
+        atexit.register(self.close)
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with write-friendly settings"""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        # journal_mode=WAL is stored in the database file; the others apply per connection
+        conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+        """)
+        return conn
+    
+    def close(self):
+        """Close the shared connection"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+    
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements in one BEGIN/COMMIT on the shared connection"""
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+    
     def init_database(self):
         """Initialize database with vehicle schema"""
-        with sqlite3.connect(str(self.db_path)) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             
             # Create vehicles table
@@ -51,6 +112,14 @@ class DatabaseManager:
                 )
             ''')
             
+            # Index for incremental extraction by scrape time
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_vehicles_scraped_at ON vehicles(scraped_at)')
+            
+            # Indexes for get_vehicle_stats: brand grouping and the priced-vehicle aggregates.
+            # (brand, price_usd) covers brand counts and per-brand price aggregates
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_vehicles_brand_price ON vehicles(brand, price_usd)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_vehicles_price_usd ON vehicles(price_usd) WHERE price_usd > 0')
+            
             # Create scraping log table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS scraping_log (
@@ -62,84 +131,109 @@ class DatabaseManager:
                 )
             ''')
             
-            conn.commit()
-            self.logger.info("Database initialized successfully")
+        self.logger.info("Database initialized successfully")
+    
+    def _vehicle_row(self, vehicle_data: Dict) -> tuple:
+        """Build the INSERT parameters for one vehicle"""
+        return tuple(map(vehicle_data.get, _COLUMNS))
+    
+    def _insert_rows(self, conn: sqlite3.Connection, rows: List[tuple]):
+        """Insert or update a batch of vehicle rows"""
+        conn.executemany(_INSERT_SQL, rows)
     
     def insert_vehicle(self, vehicle_data: Dict) -> bool:
         """Insert vehicle data into database"""
         try:
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.cursor()
-                
+            with self._transaction() as conn:
                 # Insert or update vehicle
-                cursor.execute('''
-                    INSERT OR REPLACE INTO vehicles (
-                        url, vehicle_id, brand, model, year, price_colones, price_usd,
-                        mileage, fuel_type, transmission, engine_cc, doors, style,
-                        color_exterior, color_interior, location, province,
-                        seller_phone, seller_whatsapp, description, features, images,
-                        scraped_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    vehicle_data.get('url'),
-                    vehicle_data.get('vehicle_id'),
-                    vehicle_data.get('brand'),
-                    vehicle_data.get('model'),
-                    vehicle_data.get('year'),
-                    vehicle_data.get('price_colones'),
-                    vehicle_data.get('price_usd'),
-                    vehicle_data.get('mileage'),
-                    vehicle_data.get('fuel_type'),
-                    vehicle_data.get('transmission'),
-                    vehicle_data.get('engine_cc'),
-                    vehicle_data.get('doors'),
-                    vehicle_data.get('style'),
-                    vehicle_data.get('color_exterior'),
-                    vehicle_data.get('color_interior'),
-                    vehicle_data.get('location'),
-                    vehicle_data.get('province'),
-                    vehicle_data.get('seller_phone'),
-                    vehicle_data.get('seller_whatsapp'),
-                    vehicle_data.get('description'),
-                    vehicle_data.get('features'),
-                    vehicle_data.get('images'),
-                    vehicle_data.get('scraped_at')
-                ))
-                
-                conn.commit()
-                return True
+                self._insert_rows(conn, [self._vehicle_row(vehicle_data)])
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error inserting vehicle: {e}")
             return False
     
-    def load_json_files_to_db(self, json_dir: str = "raw_data/json"):
+    def _read_vehicle_file(self, path: str):
+        """Read and decode one vehicle JSON file, returning (path, row, error)"""
+        try:
+            if ORJSON_AVAILABLE:
+                with open(path, 'rb') as f:
+                    vehicle_data = orjson.loads(f.read())
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    vehicle_data = json.load(f)
+            return path, self._vehicle_row(vehicle_data), None
+        except Exception as e:
+            return path, None, e
+    
+    def load_json_files_to_db(self, json_dir: str = "raw_data/json", batch_size: int = 10000):
         """Load all JSON files from directory into database"""
-        json_path = Path(json_dir)
         loaded = 0
         errors = 0
+        rows = []
         
-        for json_file in json_path.glob("crautos_*.json"):
+        def flush():
+            nonlocal loaded, errors
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    vehicle_data = json.load(f)
-                
-                if self.insert_vehicle(vehicle_data):
-                    loaded += 1
-                    self.logger.info(f"Loaded {vehicle_data.get('brand')} {vehicle_data.get('model')}")
-                else:
+                self._insert_rows(conn, rows)
+                loaded += len(rows)
+            except (sqlite3.Error, OverflowError):
+                # Retry row by row so one bad record (e.g. an integer too large for SQLite) doesn't cost the whole batch
+                for row in rows:
+                    try:
+                        self._insert_rows(conn, [row])
+                        loaded += 1
+                    except (sqlite3.Error, OverflowError) as e:
+                        self.logger.error(f"Error inserting vehicle {row[0]}: {e}")
+                        errors += 1
+            rows.clear()
+        
+        paths = []
+        if os.path.isdir(json_dir):
+            with os.scandir(json_dir) as entries:
+                paths = [entry.path for entry in entries
+                         if entry.name.startswith('crautos_') and entry.name.endswith('.json')]
+        
+        # Files are read and decoded on a thread pool while this thread writes batches,
+        # all inside one transaction
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor, self._transaction() as conn:
+            for json_file, row, error in executor.map(self._read_vehicle_file, paths):
+                if error is not None:
+                    self.logger.error(f"Error loading {json_file}: {error}")
                     errors += 1
-                    
-            except Exception as e:
-                self.logger.error(f"Error loading {json_file}: {e}")
-                errors += 1
+                    continue
+                rows.append(row)
+                
+                if len(rows) >= batch_size:
+                    flush()
+            
+            if rows:
+                flush()
         
+        # Refresh planner statistics after the bulk load
+        with self._lock:
+            self.conn.execute("ANALYZE")
+        
+        self.logger.info(f"Loaded {loaded} vehicles ({errors} errors)")
         return {'loaded': loaded, 'errors': errors}
     
+    def vacuum(self, min_free_ratio: float = 0.2) -> bool:
+        """Rebuild the database file once free pages exceed min_free_ratio of it"""
+        with self._lock:
+            page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not page_count or free_pages / page_count < min_free_ratio:
+                return False
+            
+            self.conn.execute("VACUUM")
+        
+        self.logger.info(f"Vacuumed database ({free_pages} of {page_count} pages were free)")
+        return True
+    
     def get_vehicle_stats(self) -> Dict:
         """Get basic statistics from database"""
-        with sqlite3.connect(str(self.db_path)) as conn:
-            cursor = conn.cursor()
+        with self._lock:
+            cursor = self.conn.cursor()
             
             # Total vehicles
             cursor.execute("SELECT COUNT(*) FROM vehicles")
@@ -22,6 +22,9 @@ def main():
     
     print(f"Loaded {results['loaded']} vehicles, {results['errors']} errors")
     
+    # Reclaim space left by replaced rows
+    db.vacuum()
+    
     # Show stats
     stats = db.get_vehicle_stats()
     print(f"\nDatabase Statistics:")
@@ -1,21 +1,52 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import json
-import time
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import re
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_scraper import make_session
+from utils import RateLimiter, make_soup
+
+# Fast JSON encoding (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Common vehicle data patterns, matched against lowercased page text
+_FIELD_PATTERNS = {
+    field: re.compile(keywords + r'[:\s]*([^\n\r,]+)')
+    for field, keywords in {
+        'price': r'(\$|precio|price)',
+        'year': r'(año|year|modelo)',
+        'brand': r'(marca|brand|make)',
+        'model': r'(modelo|model)',
+        'mileage': r'(kilometraje|mileage|km)',
+        'fuel': r'(combustible|fuel|gasolina)',
+        'transmission': r'(transmision|transmission|automatica|manual)',
+        'color': r'(color|colour)',
+        'engine': r'(motor|engine|cilindros)',
+        'location': r'(ubicacion|location|ciudad)'
+    }.items()
+}
+
+_PAGINATION_RE = re.compile(r'(?:siguiente|next|anterior|prev|\d+)', re.I)
+_LISTING_CLASS_RE = re.compile(r'(?:vehiculo|auto|car|listing)', re.I)
+_NAV_CLASS_RE = re.compile(r'(?:menu|nav)', re.I)
 
 class PageStructureAnalyzer:
     def __init__(self, base_url: str):
         self.base_url = base_url
         self.domain = urlparse(base_url).netloc
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.session = make_session()
         self.analyzed_urls = set()
+        self.rate_limiter = RateLimiter(1.0)
         self.structure = {
             'base_url': base_url,
             'domain': self.domain,
@@ -26,19 +57,45 @@ class PageStructureAnalyzer:
             'database_schema': {}
         }
     
-    def analyze_page(self, url: str, depth: int = 0, max_depth: int = 3):
-        if depth > max_depth or url in self.analyzed_urls:
+    def analyze_page(self, url: str, depth: int = 0, max_depth: int = 3, max_workers: int = 4):
+        """Breadth-first crawl from url, fetching each depth level concurrently"""
+        if url in self.analyzed_urls:
             return
-        
         self.analyzed_urls.add(url)
+        frontier = [url]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while frontier and depth <= max_depth:
+                next_frontier = []
+                
+                for page_info in executor.map(lambda u: self._fetch_page(u, depth), frontier):
+                    if page_info is None:
+                        continue
+                    self.structure['pages'][page_info['url']] = page_info
+                    
+                    # Queue child pages
+                    if depth >= max_depth:
+                        continue
+                    for link in page_info['links']['internal'][:5]:  # Limit to 5 links per page
+                        if link not in self.analyzed_urls:
+                            self.analyzed_urls.add(link)
+                            next_frontier.append(link)
+                
+                frontier = next_frontier
+                depth += 1
+    
+    def _fetch_page(self, url: str, depth: int):
+        """Fetch and analyze a single page, returning None on failure"""
+        self.rate_limiter.wait()  # Be respectful
         print(f"Analyzing: {url} (depth: {depth})")
         
         try:
             response = self.session.get(url, timeout=10)
+            self.rate_limiter.record(response.status_code)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
-            page_info = {
+            return {
                 'url': url,
                 'title': soup.title.string if soup.title else '',
                 'forms': self._analyze_forms(soup),
@@ -48,17 +105,10 @@ class PageStructureAnalyzer:
                 'filters': self._analyze_filters(soup),
                 'content_structure': self._analyze_content_structure(soup)
             }
-            
-            self.structure['pages'][url] = page_info
-            
-            # Analyze child pages
-            if depth < max_depth:
-                for link in page_info['links']['internal'][:5]:  # Limit to 5 links per page
-                    time.sleep(1)  # Be respectful
-                    self.analyze_page(link, depth + 1, max_depth)
                     
         except Exception as e:
             print(f"Error analyzing {url}: {e}")
+            return None
     
     def _analyze_forms(self, soup):
         forms = []
@@ -88,46 +138,35 @@ class PageStructureAnalyzer:
         return forms
     
     def _analyze_links(self, soup, current_url):
-        links = {'internal': [], 'external': [], 'vehicle_detail': []}
+        # Dicts act as insertion-ordered sets
+        links = {'internal': {}, 'external': {}, 'vehicle_detail': {}}
         
         for link in soup.find_all('a', href=True):
             href = link['href']
-            full_url = urljoin(current_url, href)
+            # urljoin returns absolute URLs unchanged, so only resolve relative ones
+            full_url = href if href.startswith(('http://', 'https://')) else urljoin(current_url, href)
             
             if self.domain in full_url:
-                links['internal'].append(full_url)
+                links['internal'][full_url] = None
                 
                 # Detect vehicle detail pages
-                if any(pattern in href.lower() for pattern in ['detalle', 'detail', 'vehiculo', 'auto']):
-                    links['vehicle_detail'].append(full_url)
+                href_lower = href.lower()
+                if any(pattern in href_lower for pattern in ('detalle', 'detail', 'vehiculo', 'auto')):
+                    links['vehicle_detail'][full_url] = None
             else:
-                links['external'].append(full_url)
+                links['external'][full_url] = None
         
-        return {k: list(set(v)) for k, v in links.items()}
+        return {k: list(v) for k, v in links.items()}
     
     def _extract_vehicle_data(self, soup):
         vehicle_fields = {}
         
-        # Common vehicle data patterns
-        patterns = {
-            'price': r'(\$|precio|price)',
-            'year': r'(año|year|modelo)',
-            'brand': r'(marca|brand|make)',
-            'model': r'(modelo|model)',
-            'mileage': r'(kilometraje|mileage|km)',
-            'fuel': r'(combustible|fuel|gasolina)',
-            'transmission': r'(transmision|transmission|automatica|manual)',
-            'color': r'(color|colour)',
-            'engine': r'(motor|engine|cilindros)',
-            'location': r'(ubicacion|location|ciudad)'
-        }
-        
-        # Extract from text content
+        # Extract from text content, stopping each scan after the first 3 matches
         text_content = soup.get_text().lower()
-        for field, pattern in patterns.items():
-            matches = re.findall(f'{pattern}[:\s]*([^\\n\\r,]+)', text_content, re.IGNORECASE)
+        for field, pattern in _FIELD_PATTERNS.items():
+            matches = [m.groups() for m in islice(pattern.finditer(text_content), 3)]
             if matches:
-                vehicle_fields[field] = matches[:3]  # Keep first 3 matches
+                vehicle_fields[field] = matches
         
         # Extract from structured data (classes, ids)
         structured_data = {}
@@ -150,7 +189,7 @@ class PageStructureAnalyzer:
         }
         
         # Look for pagination elements
-        for element in soup.find_all(['a', 'button'], text=re.compile(r'(siguiente|next|anterior|prev|\d+)', re.I)):
+        for element in soup.find_all(['a', 'button'], text=_PAGINATION_RE):
             text = element.get_text(strip=True).lower()
             href = element.get('href', '')
             
@@ -183,7 +222,7 @@ class PageStructureAnalyzer:
         }
         
         # Find vehicle listing containers
-        for container in soup.find_all(['div', 'article'], class_=re.compile(r'(vehiculo|auto|car|listing)', re.I)):
+        for container in soup.find_all(['div', 'article'], class_=_LISTING_CLASS_RE):
             structure['vehicle_listings'].append({
                 'class': container.get('class', []),
                 'id': container.get('id', ''),
@@ -191,7 +230,7 @@ class PageStructureAnalyzer:
             })
         
         # Find navigation menus
-        for nav in soup.find_all(['nav', 'ul'], class_=re.compile(r'(menu|nav)', re.I)):
+        for nav in soup.find_all(['nav', 'ul'], class_=_NAV_CLASS_RE):
             structure['navigation_menus'].append({
                 'class': nav.get('class', []),
                 'links_count': len(nav.find_all('a'))
@@ -258,8 +297,12 @@ class PageStructureAnalyzer:
         }
         
         filepath = f"raw_data/json/{filename}"
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.structure, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(self.structure, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(self.structure, f, indent=2, ensure_ascii=False)
         
         print(f"Analysis saved to: {filepath}")
         return filepath
@@ -1,15 +1,24 @@
+import re
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional, Generator
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from base_scraper import BaseScraper
+from config.settings import settings
 from data_models import Vehicle
-from utils import VehicleParser, LinkExtractor, ImageExtractor
+from utils import VehicleParser, LinkExtractor, ImageExtractor, RateLimiter, make_soup
+
+_COLOR_EXT_RE = re.compile(r'color\s+exterior[:\s]+([^,\n]+)')
+_COLOR_INT_RE = re.compile(r'color\s+interior[:\s]+([^,\n]+)')
+# First standalone 4-digit token in a page title is the model year
+_TITLE_YEAR_RE = re.compile(r'(?<!\S)(\d{4})(?!\S)')
 
 class CrautosScraper(BaseScraper):
     def __init__(self):
@@ -20,6 +29,13 @@ class CrautosScraper(BaseScraper):
         self.link_extractor = LinkExtractor()
         self.image_extractor = ImageExtractor()
         
+        # Detail pages are fetched concurrently; size the connection pool to match
+        self.max_workers = settings.SCRAPE_WORKERS
+        self.rate_limiter = RateLimiter(settings.SCRAPE_MAX_RPS)
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers * 2)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Setup logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -36,20 +52,20 @@ class CrautosScraper(BaseScraper):
             vehicle_links = self._get_all_vehicle_links()
             self.logger.info(f"Found {len(vehicle_links)} vehicle links")
             
-            # Scrape each vehicle
-            for link in vehicle_links:
-                try:
-                    vehicle = self._scrape_vehicle_detail(link)
-                    if vehicle:
-                        self.save_raw_data(vehicle.to_dict())
-                        vehicles_scraped += 1
-                        self.logger.info(f"Scraped vehicle {vehicle.vehicle_id}: {vehicle.brand} {vehicle.model}")
-                    
-                    time.sleep(2)  # Rate limiting
-                    
-                except Exception as e:
-                    self.logger.error(f"Error scraping {link}: {e}")
-                    errors += 1
+            # Scrape vehicles concurrently, saving results as they complete
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self._fetch_vehicle, link): link for link in vehicle_links}
+                for future in as_completed(futures):
+                    try:
+                        vehicle = future.result()
+                        if vehicle:
+                            self.save_raw_data(vehicle.to_dict())
+                            vehicles_scraped += 1
+                            self.logger.info(f"Scraped vehicle {vehicle.vehicle_id}: {vehicle.brand} {vehicle.model}")
+                        
+                    except Exception as e:
+                        self.logger.error(f"Error scraping {futures[future]}: {e}")
+                        errors += 1
                     
         except Exception as e:
             self.logger.error(f"Critical error in scraping: {e}")
@@ -64,6 +80,7 @@ class CrautosScraper(BaseScraper):
     def _get_all_vehicle_links(self) -> List[str]:
         """Get all vehicle detail page links from all listing pages"""
         all_links = []
+        seen = set()
         page = 1
         max_pages = 50  # Safety limit
         
@@ -83,17 +100,20 @@ class CrautosScraper(BaseScraper):
                         response = self.session.get(page_url)
                 
                 response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
                 
-                # Extract vehicle links from current page
-                links = self.link_extractor.extract_vehicle_links(soup, self.base_url)
+                # Extract vehicle links from current page; only anchors are needed, so skip the soup
+                links = self.link_extractor.extract_vehicle_links_stream(response.content, self.base_url)
                 
                 if not links:
                     self.logger.info(f"No vehicles found on page {page}. Stopping.")
                     break
                 
                 # Check if we're getting the same links (indicates no more pages)
-                new_links = [link for link in links if link not in all_links]
+                new_links = []
+                for link in links:
+                    if link not in seen:
+                        seen.add(link)
+                        new_links.append(link)
                 if not new_links and page > 1:
                     self.logger.info(f"No new vehicles on page {page}. Stopping.")
                     break
@@ -108,14 +128,20 @@ class CrautosScraper(BaseScraper):
                 self.logger.error(f"Error getting vehicle links from page {page}: {e}")
                 break
         
-        return list(set(all_links))
+        return all_links
+    
+    def _fetch_vehicle(self, url: str) -> Optional[Vehicle]:
+        """Scrape a vehicle detail page once the rate limiter allows it"""
+        self.rate_limiter.wait()
+        return self._scrape_vehicle_detail(url)
     
     def _scrape_vehicle_detail(self, url: str) -> Optional[Vehicle]:
         """Scrape individual vehicle detail page"""
         try:
             response = self.session.get(url)
+            self.rate_limiter.record(response.status_code)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             # Create vehicle object
             vehicle = Vehicle(url=url)
@@ -125,14 +151,17 @@ class CrautosScraper(BaseScraper):
             title = soup.title.string if soup.title else ""
             self._parse_title(vehicle, title)
             
+            # Page text is extracted once and shared by the parsers below
+            text_content = soup.get_text()
+            
             # Extract price information
-            self._parse_prices(vehicle, soup)
+            self._parse_prices(vehicle, text_content)
             
             # Extract technical details
-            self._parse_technical_details(vehicle, soup)
+            self._parse_technical_details(vehicle, text_content.lower())
             
             # Extract contact information
-            self._parse_contact_info(vehicle, soup)
+            self._parse_contact_info(vehicle, soup, text_content)
             
             # Extract images
             vehicle.images = self.image_extractor.extract_vehicle_images(soup, self.base_url)
@@ -149,29 +178,24 @@ class CrautosScraper(BaseScraper):
     def _parse_title(self, vehicle: Vehicle, title: str):
         """Parse vehicle info from page title"""
         # Title format: "crautos.com Brand MODEL Year ¢ price ($ usd_price)*"
-        parts = title.split()
-        
-        for i, part in enumerate(parts):
-            if part.isdigit() and len(part) == 4:  # Year
-                vehicle.year = int(part)
-                if i > 1:
-                    vehicle.brand = parts[1] if len(parts) > 1 else ""
-                    vehicle.model = ' '.join(parts[2:i]) if i > 2 else ""
-                break
+        match = _TITLE_YEAR_RE.search(title)
+        if match:
+            vehicle.year = int(match.group(1))
+            # Tokens before the year: site name, brand, then model words
+            parts = title[:match.start()].split()
+            if len(parts) > 1:
+                vehicle.brand = parts[1]
+                vehicle.model = ' '.join(parts[2:])
         
         vehicle.normalize_brand()
     
-    def _parse_prices(self, vehicle: Vehicle, soup: BeautifulSoup):
+    def _parse_prices(self, vehicle: Vehicle, text_content: str):
         """Parse price information"""
-        text_content = soup.get_text()
-        
         vehicle.price_colones = self.parser.extract_price_colones(text_content)
         vehicle.price_usd = self.parser.extract_price_usd(text_content)
     
-    def _parse_technical_details(self, vehicle: Vehicle, soup: BeautifulSoup):
-        """Parse technical specifications"""
-        text_content = soup.get_text().lower()
-        
+    def _parse_technical_details(self, vehicle: Vehicle, text_content: str):
+        """Parse technical specifications from lowercased page text"""
         # Extract mileage
         vehicle.mileage = self.parser.extract_mileage(text_content)
         
@@ -193,25 +217,15 @@ class CrautosScraper(BaseScraper):
             vehicle.transmission = 'Automática'
         
         # Extract colors (look for specific patterns)
-        color_patterns = [
-            r'color\s+exterior[:\s]+([^,\n]+)',
-            r'color\s+interior[:\s]+([^,\n]+)'
-        ]
-        
-        for i, pattern in enumerate(color_patterns):
-            import re
-            match = re.search(pattern, text_content)
-            if match:
-                color = match.group(1).strip().title()
-                if i == 0:
-                    vehicle.color_exterior = color
-                else:
-                    vehicle.color_interior = color
+        match = _COLOR_EXT_RE.search(text_content)
+        if match:
+            vehicle.color_exterior = match.group(1).strip().title()
+        match = _COLOR_INT_RE.search(text_content)
+        if match:
+            vehicle.color_interior = match.group(1).strip().title()
     
-    def _parse_contact_info(self, vehicle: Vehicle, soup: BeautifulSoup):
+    def _parse_contact_info(self, vehicle: Vehicle, soup: BeautifulSoup, text_content: str):
         """Parse contact information"""
-        text_content = soup.get_text()
-        
         # Extract phone numbers
         phones = self.parser.extract_phone_numbers(text_content)
         if phones:
@@ -1,3 +1,4 @@
-from .parsers import VehicleParser, LinkExtractor, ImageExtractor
+from .parsers import VehicleParser, LinkExtractor, ImageExtractor, HTML_PARSER, make_soup
+from .rate_limiter import RateLimiter
 
-__all__ = ['VehicleParser', 'LinkExtractor', 'ImageExtractor']
\ No newline at end of file
+__all__ = ['VehicleParser', 'LinkExtractor', 'ImageExtractor', 'HTML_PARSER', 'make_soup', 'RateLimiter']
\ No newline at end of file
@@ -1,38 +1,110 @@
 import re
+from functools import lru_cache
+from io import BytesIO
 from typing import Optional, List, Dict
 from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin, urlparse
 
+# Use the C-based lxml parser when installed
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+    HTML_PARSER = 'lxml'
+except ImportError:
+    LXML_AVAILABLE = False
+    HTML_PARSER = 'html.parser'
+
+def make_soup(html) -> BeautifulSoup:
+    """Parse an HTML document with the fastest available parser"""
+    return BeautifulSoup(html, HTML_PARSER)
+
+# Hrefs urljoin would rewrite: params, empty query/fragment markers, stripped
+# control characters and bracketed hosts it validates
+_URLJOIN_ONLY_RE = re.compile(r'[;\[\]\t\n\r]|\?#|[?#]$')
+
+@lru_cache(maxsize=32)
+def _origin(base_url: str) -> str:
+    """scheme://host prefix of a base URL"""
+    parsed = urlparse(base_url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+@lru_cache(maxsize=1024)
+def _cached_urljoin(base_url: str, href: str) -> str:
+    """urljoin with memoization; listing pages repeat the same hrefs"""
+    return urljoin(base_url, href)
+
+def _join(base_url: str, href: str) -> str:
+    """Resolve href against base_url, skipping urljoin for the common absolute and root-relative forms"""
+    if _URLJOIN_ONLY_RE.search(href):
+        return _cached_urljoin(base_url, href)
+    # Absolute URLs with a host come back from urljoin unchanged
+    host_start = 7 if href.startswith('http://') else 8 if href.startswith('https://') else 0
+    if host_start and len(href) > host_start and href[host_start] not in '/?#':
+        return href
+    # Root-relative paths without dot segments resolve to the base origin plus the path
+    if href.startswith('/') and not href.startswith('//') and '/.' not in href:
+        return _origin(base_url) + href
+    return _cached_urljoin(base_url, href)
+
+# Field patterns used by VehicleParser
+# Commas may appear anywhere between the currency sign and the amount; they're dropped afterwards
+_PRICE_COLONES_RE = re.compile(r'¢[\s,]*([\d.][\d.,]*)')
+_PRICE_USD_RE = re.compile(r'\$[\s,]*([\d.][\d.,]*)')
+_SEPARATOR_TABLE = str.maketrans('', '', '.,')
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+# Case-insensitive so callers' text needn't be lowercased first
+_MILEAGE_KM_RE = re.compile(r'(\d+)[\s,]*k?m?s?\s*km', re.IGNORECASE)
+_MILEAGE_MIL_RE = re.compile(r'(\d+)[\s,]*mil', re.IGNORECASE)
+_ENGINE_CC_RE = re.compile(r'(\d+)\s*c[c|m]', re.IGNORECASE)
+_ENGINE_L_RE = re.compile(r'(\d+)\s*l', re.IGNORECASE)
+_PHONE_RES = (
+    re.compile(r'\b\d{4}-\d{4}\b'),  # 8888-8888
+    re.compile(r'\b\d{8}\b'),        # 88888888
+    re.compile(r'\+506\s*\d{8}'),    # +506 88888888
+)
+
+# Image sources that look like vehicle photos
+_IMAGE_KEYWORD_RE = re.compile(r'vehicle|car|auto|foto', re.IGNORECASE)
+
+# Pagination control keywords, matched anywhere in lowercased link text
+_NEXT_PAGE_RE = re.compile(r'siguiente|next|>')
+_PREV_PAGE_RE = re.compile(r'anterior|prev|<')
+
 class VehicleParser:
     @staticmethod
     def extract_price_colones(text: str) -> Optional[int]:
         """Extract price in colones from text"""
-        match = re.search(r'¢\s*([\d,\.]+)', text.replace(',', ''))
+        # A plain substring check rejects texts without the sign far faster than the regex scan
+        if '¢' not in text:
+            return None
+        match = _PRICE_COLONES_RE.search(text)
         if match:
-            return int(match.group(1).replace('.', '').replace(',', ''))
+            return int(match.group(1).translate(_SEPARATOR_TABLE))
         return None
     
     @staticmethod
     def extract_price_usd(text: str) -> Optional[int]:
         """Extract USD price from text"""
-        match = re.search(r'\$\s*([\d,\.]+)', text.replace(',', ''))
+        if '$' not in text:
+            return None
+        match = _PRICE_USD_RE.search(text)
         if match:
-            return int(match.group(1).replace('.', '').replace(',', ''))
+            return int(match.group(1).translate(_SEPARATOR_TABLE))
         return None
     
     @staticmethod
     def extract_year(text: str) -> Optional[int]:
         """Extract year from text"""
-        match = re.search(r'\b(19|20)\d{2}\b', text)
+        match = _YEAR_RE.search(text)
         return int(match.group()) if match else None
     
     @staticmethod
     def extract_mileage(text: str) -> Optional[int]:
         """Extract mileage from text"""
-        match = re.search(r'(\d+)[\s,]*k?m?s?\s*km', text.lower())
+        match = _MILEAGE_KM_RE.search(text)
         if match:
             return int(match.group(1)) * 1000
-        match = re.search(r'(\d+)[\s,]*mil', text.lower())
+        match = _MILEAGE_MIL_RE.search(text)
         if match:
             return int(match.group(1)) * 1000
         return None
@@ -40,10 +112,10 @@ class VehicleParser:
     @staticmethod
     def extract_engine_cc(text: str) -> Optional[int]:
         """Extract engine displacement in CC"""
-        match = re.search(r'(\d+)\s*c[c|m]', text.lower())
+        match = _ENGINE_CC_RE.search(text)
         if match:
             return int(match.group(1))
-        match = re.search(r'(\d+)\s*l', text.lower())
+        match = _ENGINE_L_RE.search(text)
         if match:
             return int(match.group(1)) * 1000
         return None
@@ -51,15 +123,11 @@ class VehicleParser:
     @staticmethod
     def extract_phone_numbers(text: str) -> List[str]:
         """Extract phone numbers from text"""
-        patterns = [
-            r'\b\d{4}-\d{4}\b',  # 8888-8888
-            r'\b\d{8}\b',        # 88888888
-            r'\+506\s*\d{8}',    # +506 88888888
-        ]
-        phones = []
-        for pattern in patterns:
-            phones.extend(re.findall(pattern, text))
-        return list(set(phones))
+        # Dict keys dedupe while keeping first-seen order
+        phones = {}
+        for pattern in _PHONE_RES:
+            phones.update(dict.fromkeys(pattern.findall(text)))
+        return list(phones)
     
     @staticmethod
     def clean_text(text: str) -> str:
@@ -68,17 +136,52 @@ class VehicleParser:
             return ""
         return ' '.join(text.strip().split())
 
+def _mentions_pagination(form: Tag) -> bool:
+    """Check a form's tag names, attributes and text for pagination keywords without serializing it"""
+    for node in (form, *form.descendants):
+        if isinstance(node, Tag):
+            parts = [node.name]
+            for name, value in node.attrs.items():
+                parts.append(name)
+                parts.append(' '.join(value) if isinstance(value, list) else value)
+        else:
+            parts = [node]
+        for part in parts:
+            part = part.lower()
+            if 'page' in part or 'siguiente' in part:
+                return True
+    return False
+
 class LinkExtractor:
     @staticmethod
     def extract_vehicle_links(soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract vehicle detail page links"""
-        links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if 'cardetail.cfm' in href and 'c=' in href:
-                full_url = urljoin(base_url, href)
-                links.append(full_url)
-        return list(set(links))
+        links = {}
+        # A bare tag-name find_all is much cheaper than attribute matching with href=True
+        for link in soup.find_all('a'):
+            href = link.get('href')
+            if href and 'cardetail.cfm' in href and 'c=' in href:
+                links[_join(base_url, href)] = None
+        return list(links)
+    
+    @staticmethod
+    def extract_vehicle_links_stream(html: bytes, base_url: str) -> List[str]:
+        """Extract vehicle detail page links from raw HTML without building a soup"""
+        if not LXML_AVAILABLE:
+            return LinkExtractor.extract_vehicle_links(make_soup(html), base_url)
+        
+        links = {}
+        # lxml builds the tree in C; only <a> elements surface to Python and are cleared once read
+        try:
+            for _, link in etree.iterparse(BytesIO(html), events=('end',), tag='a', html=True):
+                href = link.get('href')
+                if href and 'cardetail.cfm' in href and 'c=' in href:
+                    links[_join(base_url, href)] = None
+                link.clear(keep_tail=True)
+        except etree.XMLSyntaxError:
+            # Raised for empty documents
+            pass
+        return list(links)
     
     @staticmethod
     def extract_pagination_links(soup: BeautifulSoup, base_url: str) -> Dict[str, Optional[str]]:
@@ -90,18 +193,19 @@ class LinkExtractor:
             text = element.get_text(strip=True).lower()
             href = element.get('href', '')
             
-            if any(word in text for word in ['siguiente', 'next', '>']):
-                pagination['next'] = urljoin(base_url, href) if href else None
-            elif any(word in text for word in ['anterior', 'prev', '<']):
-                pagination['prev'] = urljoin(base_url, href) if href else None
+            if _NEXT_PAGE_RE.search(text):
+                pagination['next'] = _join(base_url, href) if href else None
+            elif _PREV_PAGE_RE.search(text):
+                pagination['prev'] = _join(base_url, href) if href else None
             elif text.isdigit():
-                pagination['pages'].append(urljoin(base_url, href) if href else None)
+                pagination['pages'].append(_join(base_url, href) if href else None)
         
         # Also check for form-based pagination (common in ColdFusion sites)
         forms = soup.find_all('form')
         for form in forms:
-            if 'page' in str(form).lower() or 'siguiente' in str(form).lower():
+            if _mentions_pagination(form):
                 pagination['has_form_pagination'] = True
+                break
         
         return pagination
 
@@ -109,13 +213,12 @@ class ImageExtractor:
     @staticmethod
     def extract_vehicle_images(soup: BeautifulSoup, base_url: str) -> List[str]:
         """Extract vehicle image URLs"""
-        images = []
+        images = {}
         
         # Look for images in common containers
         for img in soup.find_all('img'):
             src = img.get('src', '')
-            if src and any(keyword in src.lower() for keyword in ['vehicle', 'car', 'auto', 'foto']):
-                full_url = urljoin(base_url, src)
-                images.append(full_url)
+            if src and _IMAGE_KEYWORD_RE.search(src):
+                images[_join(base_url, src)] = None
         
-        return list(set(images))
\ No newline at end of file
+        return list(images)
\ No newline at end of file
@@ -0,0 +1,36 @@
+import threading
+import time
+
+# Status codes that signal the server wants us to slow down
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+class RateLimiter:
+    """Thread-safe adaptive limiter: halves the rate when throttled, creeps back up on success"""
+    
+    def __init__(self, requests_per_second: float, min_requests_per_second: float = 0.1):
+        self.max_rate = requests_per_second
+        self.min_rate = min(min_requests_per_second, requests_per_second)
+        self.rate = requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+    
+    def wait(self):
+        """Block until the caller's request slot comes up"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + 1.0 / self.rate
+        
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+    
+    def record(self, status_code: int):
+        """Adjust the rate from a response status code"""
+        with self._lock:
+            if status_code in THROTTLE_STATUS_CODES:
+                self.rate = max(self.min_rate, self.rate / 2)
+                # Push the next slot out so in-flight workers back off immediately
+                self._next_slot = max(self._next_slot, time.monotonic()) + 1.0 / self.rate
+            elif self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)